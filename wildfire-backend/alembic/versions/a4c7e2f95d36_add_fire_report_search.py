@@ -0,0 +1,57 @@
+"""add fire report full-text search
+
+Revision ID: a4c7e2f95d36
+Revises: f3a6d8c1b954
+Create Date: 2026-02-09 11:27:40.918352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e2f95d36'
+down_revision: Union[str, Sequence[str], None] = 'f3a6d8c1b954'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Stemmed Turkish for title (A) and description (B); 'simple' keeps the raw
+# words too (district / place names the Turkish stemmer would mangle) and is
+# the only config applied to location.
+SEARCH_VECTOR = """
+    setweight(to_tsvector('turkish', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('turkish', coalesce({row}description, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce({row}title, '') || ' ' || coalesce({row}description, '') || ' ' ||
+                                    coalesce({row}location, '')), 'C')
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('fire_reports', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(f"""
+        CREATE FUNCTION fire_reports_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR.format(row='NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER fire_reports_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description, location ON fire_reports
+        FOR EACH ROW EXECUTE FUNCTION fire_reports_search_vector_update()
+    """)
+    op.execute(f"UPDATE fire_reports SET search_vector = {SEARCH_VECTOR.format(row='')}")
+    op.create_index('ix_fire_reports_search_vector', 'fire_reports', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_fire_reports_search_vector', table_name='fire_reports', postgresql_using='gin')
+    op.execute("DROP TRIGGER fire_reports_search_vector_trigger ON fire_reports")
+    op.execute("DROP FUNCTION fire_reports_search_vector_update()")
+    op.drop_column('fire_reports', 'search_vector')
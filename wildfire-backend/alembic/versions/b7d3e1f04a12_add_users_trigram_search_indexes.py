@@ -0,0 +1,37 @@
+"""add users trigram search indexes
+
+Revision ID: b7d3e1f04a12
+Revises: 4472ffe70e8d
+Create Date: 2026-01-05 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e1f04a12'
+down_revision: Union[str, Sequence[str], None] = '4472ffe70e8d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_users_email_trgm', 'users', ['email'], unique=False,
+        postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_users_full_name_trgm', 'users', ['full_name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_full_name_trgm', table_name='users')
+    op.drop_index('ix_users_email_trgm', table_name='users')
@@ -0,0 +1,43 @@
+"""add geofence subscriptions
+
+Revision ID: b9d1f4a7c283
+Revises: a4c7e2f95d36
+Create Date: 2026-02-16 15:48:22.604137
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9d1f4a7c283'
+down_revision: Union[str, Sequence[str], None] = 'a4c7e2f95d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('geofence_subscriptions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=True),
+    sa.Column('geometry', sa.JSON(), nullable=True),
+    sa.Column('latitude', sa.DECIMAL(precision=10, scale=8), nullable=True),
+    sa.Column('longitude', sa.DECIMAL(precision=11, scale=8), nullable=True),
+    sa.Column('radius_m', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_geofence_subscriptions_user_id'), 'geofence_subscriptions', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_geofence_subscriptions_user_id'), table_name='geofence_subscriptions')
+    op.drop_table('geofence_subscriptions')
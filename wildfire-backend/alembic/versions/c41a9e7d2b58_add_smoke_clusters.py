@@ -0,0 +1,49 @@
+"""add smoke clusters
+
+Revision ID: c41a9e7d2b58
+Revises: b7d3e1f04a12
+Create Date: 2026-01-12 14:03:52.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41a9e7d2b58'
+down_revision: Union[str, Sequence[str], None] = 'b7d3e1f04a12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('smoke_clusters',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('latitude', sa.DECIMAL(precision=10, scale=8), nullable=False),
+    sa.Column('longitude', sa.DECIMAL(precision=11, scale=8), nullable=False),
+    sa.Column('district', sa.String(length=100), nullable=True),
+    sa.Column('detection_count', sa.Integer(), nullable=True),
+    sa.Column('max_risk_score', sa.DECIMAL(precision=4, scale=3), nullable=True),
+    sa.Column('report_id', sa.Integer(), nullable=True),
+    sa.Column('first_seen_at', sa.DateTime(), nullable=True),
+    sa.Column('last_seen_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['report_id'], ['fire_reports.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_smoke_clusters_last_seen_at'), 'smoke_clusters', ['last_seen_at'], unique=False)
+    op.add_column('smoke_detections', sa.Column('cluster_id', sa.UUID(), nullable=True))
+    op.create_index(op.f('ix_smoke_detections_cluster_id'), 'smoke_detections', ['cluster_id'], unique=False)
+    op.create_foreign_key('fk_smoke_detections_cluster_id', 'smoke_detections', 'smoke_clusters', ['cluster_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_smoke_detections_cluster_id', 'smoke_detections', type_='foreignkey')
+    op.drop_index(op.f('ix_smoke_detections_cluster_id'), table_name='smoke_detections')
+    op.drop_column('smoke_detections', 'cluster_id')
+    op.drop_index(op.f('ix_smoke_clusters_last_seen_at'), table_name='smoke_clusters')
+    op.drop_table('smoke_clusters')
@@ -0,0 +1,52 @@
+"""add updated_at and soft-delete tombstones
+
+Revision ID: d5e8f3a91c27
+Revises: c41a9e7d2b58
+Create Date: 2026-01-19 10:41:07.352816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e8f3a91c27'
+down_revision: Union[str, Sequence[str], None] = 'c41a9e7d2b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables served by GET /sync
+SYNCED_TABLES = ('fire_incidents', 'fire_stations', 'fire_reports', 'smoke_detections')
+NEW_UPDATED_AT = ('fire_incidents', 'fire_stations', 'smoke_detections', 'smoke_clusters', 'users')
+TOMBSTONE_TABLES = ('fire_incidents', 'fire_stations', 'fire_reports')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in NEW_UPDATED_AT:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+    for table in NEW_UPDATED_AT:
+        op.execute(f"UPDATE {table} SET updated_at = created_at" if table != 'smoke_clusters'
+                   else "UPDATE smoke_clusters SET updated_at = last_seen_at")
+    for table in TOMBSTONE_TABLES:
+        op.add_column(table, sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    for table in SYNCED_TABLES:
+        op.create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in SYNCED_TABLES:
+        op.drop_index(op.f(f'ix_{table}_updated_at'), table_name=table)
+    # Tombstones become real deletes again; detach rows still pointing at them
+    op.execute("UPDATE fire_incidents SET assigned_station_id = NULL WHERE assigned_station_id IN "
+               "(SELECT id FROM fire_stations WHERE deleted_at IS NOT NULL)")
+    op.execute("UPDATE smoke_clusters SET report_id = NULL WHERE report_id IN "
+               "(SELECT id FROM fire_reports WHERE deleted_at IS NOT NULL)")
+    for table in TOMBSTONE_TABLES:
+        op.execute(f"DELETE FROM {table} WHERE deleted_at IS NOT NULL")
+        op.drop_column(table, 'deleted_at')
+    for table in NEW_UPDATED_AT:
+        op.drop_column(table, 'updated_at')
@@ -0,0 +1,50 @@
+"""add daily rollups
+
+Revision ID: e7b2c94f0d13
+Revises: d5e8f3a91c27
+Create Date: 2026-01-26 09:12:44.508137
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2c94f0d13'
+down_revision: Union[str, Sequence[str], None] = 'd5e8f3a91c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUP_SOURCES = ('fire_incidents', 'smoke_detections', 'fire_reports')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_rollups',
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('district', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('entity', 'day', 'district', 'status')
+    )
+    op.create_table('rollup_watermarks',
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('watermark', sa.DateTime(), nullable=True),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('entity')
+    )
+    # A refresh recounts one created day at a time
+    for table in ROLLUP_SOURCES:
+        op.create_index(op.f(f'ix_{table}_created_at'), table, ['created_at'], unique=False)
+    # Rollups are filled by the first refresh (no watermark = full rebuild)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ROLLUP_SOURCES:
+        op.drop_index(op.f(f'ix_{table}_created_at'), table_name=table)
+    op.drop_table('rollup_watermarks')
+    op.drop_table('daily_rollups')
@@ -0,0 +1,80 @@
+"""partition smoke_detections by month
+
+Revision ID: f3a6d8c1b954
+Revises: e7b2c94f0d13
+Create Date: 2026-02-02 14:03:51.220694
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a6d8c1b954'
+down_revision: Union[str, Sequence[str], None] = 'e7b2c94f0d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created past the current one; the maintenance job keeps this window
+# rolling (app/services/partition_service.py)
+MONTHS_AHEAD = 3
+INDEXED_COLUMNS = ('created_at', 'updated_at', 'cluster_id')
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes() -> None:
+    for column in INDEXED_COLUMNS:
+        op.create_index(op.f(f'ix_smoke_detections_{column}'), 'smoke_detections', [column], unique=False)
+    op.create_foreign_key('fk_smoke_detections_cluster_id', 'smoke_detections', 'smoke_clusters', ['cluster_id'], ['id'])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    op.execute("UPDATE smoke_detections SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL")
+
+    # The partition key has to be part of every unique constraint, so the
+    # primary key becomes (id, created_at)
+    op.execute("CREATE TABLE smoke_detections_partitioned (LIKE smoke_detections INCLUDING DEFAULTS) "
+               "PARTITION BY RANGE (created_at)")
+    op.execute("ALTER TABLE smoke_detections_partitioned ALTER COLUMN created_at SET NOT NULL")
+    op.execute("ALTER TABLE smoke_detections_partitioned ADD CONSTRAINT smoke_detections_partitioned_pkey "
+               "PRIMARY KEY (id, created_at)")
+
+    this_month = datetime.utcnow().date().replace(day=1)
+    first = bind.execute(sa.text("SELECT min(created_at) FROM smoke_detections")).scalar()
+    month = first.date().replace(day=1) if first else this_month
+    while month <= _add_months(this_month, MONTHS_AHEAD):
+        following = _add_months(month, 1)
+        op.execute(f"CREATE TABLE smoke_detections_y{month:%Y}m{month:%m} PARTITION OF smoke_detections_partitioned "
+                   f"FOR VALUES FROM ('{month}') TO ('{following}')")
+        month = following
+    # Safety net for rows past the prepared window (e.g. the job not running)
+    op.execute("CREATE TABLE smoke_detections_default PARTITION OF smoke_detections_partitioned DEFAULT")
+
+    op.execute("INSERT INTO smoke_detections_partitioned SELECT * FROM smoke_detections")
+    op.drop_table('smoke_detections')
+    op.execute("ALTER TABLE smoke_detections_partitioned RENAME TO smoke_detections")
+    op.execute("ALTER TABLE smoke_detections RENAME CONSTRAINT smoke_detections_partitioned_pkey TO smoke_detections_pkey")
+    _create_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Partitions already archived by the retention job are not restored
+    op.execute("CREATE TABLE smoke_detections_plain (LIKE smoke_detections INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE smoke_detections_plain ALTER COLUMN created_at DROP NOT NULL")
+    op.execute("INSERT INTO smoke_detections_plain SELECT * FROM smoke_detections")
+    # Dropping the parent drops every partition with it
+    op.drop_table('smoke_detections')
+    op.execute("ALTER TABLE smoke_detections_plain RENAME TO smoke_detections")
+    op.create_primary_key('smoke_detections_pkey', 'smoke_detections', ['id'])
+    op.create_unique_constraint('smoke_detections_id_key', 'smoke_detections', ['id'])
+    _create_indexes()
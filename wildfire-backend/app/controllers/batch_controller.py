@@ -0,0 +1,8 @@
+from sqlalchemy.orm import Session
+from app.schemas.batch import BatchRequest
+from app.services import batch_service
+
+def handle_apply_batch(db: Session, data: BatchRequest):
+    """Apply batch mutations - controller logic"""
+    results = batch_service.apply_batch(db, data.operations)
+    return {"success": True, "results": results}
@@ -0,0 +1,29 @@
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Optional
+from app.services import export_service
+from app.utils.geo import parse_bbox
+
+def handle_export(
+    entity: str,
+    export_format: str = "ndjson",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    bbox: Optional[str] = None
+):
+    """Stream a full table export - controller logic"""
+    if entity not in export_service.EXPORT_ENTITIES:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {entity}")
+    if bbox and not export_service.supports_bbox(entity):
+        raise HTTPException(status_code=400, detail=f"{entity} has no coordinates; bbox is not supported")
+    try:
+        box = parse_bbox(bbox) if bbox else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    filename = f"{entity}-{datetime.utcnow():%Y%m%d%H%M%S}.{export_format}"
+    return StreamingResponse(
+        export_service.stream_export(entity, export_format, since, until, box),
+        media_type=export_service.EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "X-Accel-Buffering": "no"}
+    )
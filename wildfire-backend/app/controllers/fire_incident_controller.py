@@ -1,23 +1,56 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from typing import Optional, Set
 from uuid import UUID
-from app.schemas.fire_incident import FireIncidentCreate, FireIncidentUpdate
+from app.schemas.fire_incident import (
+    FireIncidentCreate, FireIncidentUpdate, FireIncidentExpandedResponse, StationSummary, ReporterSummary
+)
+from app.models.user import User
 from app.services import fire_incident_service
 
 def handle_create_fire_incident(db: Session, data: FireIncidentCreate):
     """Create fire incident - controller logic"""
     return fire_incident_service.create_fire_incident(db, data)
 
-def handle_get_fire_incidents(db: Session, skip: int = 0, limit: int = 100):
+# Reporter names/roles are personal data: not for anonymous or citizen callers
+REPORTER_EXPAND_ROLES = ("firefighter", "admin")
+
+def parse_expand(expand: Optional[str], current_user: Optional[User] = None) -> Set[str]:
+    """"station,reporter" -> {"station", "reporter"}"""
+    names = {name.strip() for name in (expand or "").split(",") if name.strip()}
+    unknown = names - fire_incident_service.EXPAND_RELATIONSHIPS.keys()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown expand: {', '.join(sorted(unknown))}")
+    if "reporter" in names and (current_user is None or current_user.role not in REPORTER_EXPAND_ROLES):
+        raise HTTPException(status_code=403, detail="expand=reporter requires a firefighter or admin account")
+    return names
+
+def _expanded(incident, expand: Set[str]) -> FireIncidentExpandedResponse:
+    # Relationships are only touched when expanded (already eager-loaded then)
+    response = FireIncidentExpandedResponse.model_validate(incident)
+    if "station" in expand:
+        station = incident.assigned_station
+        response.station = StationSummary.model_validate(station) if station else None
+    if "reporter" in expand:
+        reporter = incident.reported_by_user
+        response.reporter = ReporterSummary.model_validate(reporter) if reporter else None
+    return response
+
+def handle_get_fire_incidents(db: Session, skip: int = 0, limit: int = 100, expand: Optional[str] = None,
+                              current_user: Optional[User] = None):
     """Get all fire incidents - controller logic"""
-    return fire_incident_service.get_fire_incidents(db, skip, limit)
+    names = parse_expand(expand, current_user)
+    incidents = fire_incident_service.get_fire_incidents(db, skip, limit, names)
+    return [_expanded(incident, names) for incident in incidents]
 
-def handle_get_fire_incident(db: Session, incident_id: UUID):
+def handle_get_fire_incident(db: Session, incident_id: UUID, expand: Optional[str] = None,
+                             current_user: Optional[User] = None):
     """Get single fire incident - controller logic"""
-    incident = fire_incident_service.get_fire_incident_by_id(db, incident_id)
+    names = parse_expand(expand, current_user)
+    incident = fire_incident_service.get_fire_incident_by_id(db, incident_id, names)
     if not incident:
         raise HTTPException(status_code=404, detail="Fire incident not found")
-    return incident
+    return _expanded(incident, names)
 
 def handle_update_fire_incident(db: Session, incident_id: UUID, data: FireIncidentUpdate):
     """Update fire incident - controller logic"""
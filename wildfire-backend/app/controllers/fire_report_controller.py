@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from typing import Optional
 from app.schemas.fire_report import FireReportCreate, FireReportUpdate
 from app.services import fire_report_service
 
@@ -11,6 +12,17 @@ def handle_get_fire_reports(db: Session, skip: int = 0, limit: int = 100):
     """Get all fire reports - controller logic"""
     return fire_report_service.get_fire_reports(db, skip, limit)
 
+def handle_search_fire_reports(db: Session, q: str, limit: int = fire_report_service.FIRE_REPORT_SEARCH_LIMIT, cursor: Optional[str] = None, sort: str = "rank"):
+    """Full-text search over fire reports - controller logic"""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Search query must not be empty")
+    if limit < 1 or limit > fire_report_service.FIRE_REPORT_SEARCH_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {fire_report_service.FIRE_REPORT_SEARCH_MAX_LIMIT}")
+    try:
+        return fire_report_service.search_fire_reports(db, q.strip(), limit, cursor, sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 def handle_get_fire_report(db: Session, report_id: int):
     """Get single fire report - controller logic"""
     report = fire_report_service.get_fire_report_by_id(db, report_id)
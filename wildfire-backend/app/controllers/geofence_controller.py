@@ -0,0 +1,20 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from uuid import UUID
+from app.models.user import User
+from app.schemas.geofence import GeofenceSubscriptionCreate
+from app.services import geofence_service
+
+def handle_create_subscription(db: Session, user: User, data: GeofenceSubscriptionCreate):
+    """Create geofence subscription - controller logic"""
+    return geofence_service.create_subscription(db, user.id, data)
+
+def handle_get_subscriptions(db: Session, user: User):
+    """List own geofence subscriptions - controller logic"""
+    return geofence_service.get_subscriptions(db, user.id)
+
+def handle_delete_subscription(db: Session, user: User, subscription_id: UUID):
+    """Delete own geofence subscription - controller logic"""
+    if not geofence_service.delete_subscription(db, user.id, subscription_id):
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    return {"message": "Subscription deleted successfully"}
@@ -0,0 +1,26 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, UploadFile
+from typing import Optional
+from app.services import import_service
+
+IMPORT_METHODS = ("insert", "copy")
+
+def handle_import(
+    db: Session,
+    entity: str,
+    file: UploadFile,
+    file_format: Optional[str] = None,
+    chunk_size: int = import_service.IMPORT_CHUNK_SIZE,
+    method: Optional[str] = None,
+    dry_run: bool = False
+):
+    """Bulk import stations/incidents - controller logic"""
+    if method and method not in IMPORT_METHODS:
+        raise HTTPException(status_code=400, detail=f"method must be one of {', '.join(IMPORT_METHODS)}")
+    if method == "copy" and import_service.default_method(db) != "copy":
+        raise HTTPException(status_code=400, detail="COPY requires PostgreSQL")
+    try:
+        file_format = file_format or import_service.detect_format(file.filename, file.content_type)
+        return import_service.import_rows(db, entity, file.file, file_format, chunk_size, method, dry_run)
+    except import_service.ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,20 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from uuid import UUID
+from app.services import smoke_cluster_service
+
+def handle_get_smoke_clusters(db: Session, skip: int = 0, limit: int = 100, active: bool = False):
+    """Get smoke clusters - controller logic"""
+    return smoke_cluster_service.get_smoke_clusters(db, skip, limit, active)
+
+def handle_get_smoke_cluster(db: Session, cluster_id: UUID):
+    """Get single smoke cluster - controller logic"""
+    cluster = smoke_cluster_service.get_smoke_cluster_by_id(db, cluster_id)
+    if not cluster:
+        raise HTTPException(status_code=404, detail="Smoke cluster not found")
+    return cluster
+
+def handle_get_cluster_detections(db: Session, cluster_id: UUID, skip: int = 0, limit: int = 100):
+    """Get detections of a smoke cluster - controller logic"""
+    handle_get_smoke_cluster(db, cluster_id)
+    return smoke_cluster_service.get_cluster_detections(db, cluster_id, skip, limit)
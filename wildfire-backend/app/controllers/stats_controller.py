@@ -0,0 +1,33 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from datetime import date
+from typing import Optional
+from app.services import stats_service
+
+def _check(entity: str, since: Optional[date], until: Optional[date]):
+    if entity not in stats_service.ROLLUP_ENTITIES:
+        raise HTTPException(status_code=404, detail=f"Unknown stats entity: {entity}")
+    if since and until and since > until:
+        raise HTTPException(status_code=400, detail="since must not be after until")
+
+def handle_get_daily_stats(db: Session, entity: str, since: Optional[date] = None, until: Optional[date] = None, district: Optional[str] = None):
+    """Daily counts from the rollup table - controller logic"""
+    _check(entity, since, until)
+    return {
+        "entity": entity,
+        "refreshed_at": stats_service.get_refreshed_at(db, entity),
+        "items": stats_service.get_daily_stats(db, entity, since, until, district)
+    }
+
+def handle_get_district_stats(db: Session, entity: str, since: Optional[date] = None, until: Optional[date] = None):
+    """Per-district counts from the rollup table - controller logic"""
+    _check(entity, since, until)
+    return {
+        "entity": entity,
+        "refreshed_at": stats_service.get_refreshed_at(db, entity),
+        "items": stats_service.get_district_stats(db, entity, since, until)
+    }
+
+def handle_refresh(db: Session):
+    """Run the rollup delta job now - controller logic"""
+    return {"refreshed_days": stats_service.refresh_rollups(db)}
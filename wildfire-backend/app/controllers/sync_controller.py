@@ -0,0 +1,18 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from typing import Optional
+from app.services import sync_service
+
+def handle_get_changes(db: Session, since: Optional[str] = None, limit: int = sync_service.SYNC_PAGE_LIMIT, tables: Optional[str] = None):
+    """Delta sync - controller logic"""
+    try:
+        since_value = sync_service.decode_cursor(since) if since else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid sync cursor")
+    names = [name.strip() for name in tables.split(",") if name.strip()] if tables else None
+    unknown = [name for name in names or [] if name not in sync_service.SYNC_TABLES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sync tables: {', '.join(unknown)}")
+    if limit < 1 or limit > sync_service.SYNC_MAX_PAGE_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {sync_service.SYNC_MAX_PAGE_LIMIT}")
+    return sync_service.get_changes(db, since_value, limit, names)
@@ -1,19 +1,111 @@
 # main FastAPI app entry point
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
 from contextlib import asynccontextmanager
+import asyncio
 import httpx
 import time
 
-from app.routes import health, smoke, risk, fire_reports, fire_incidents, fire_stations, auth, admin
+from app.routes import health, smoke, risk, fire_reports, fire_incidents, fire_stations, auth, admin, images, alerts, sync, batch, export, stats, geofences
+from app.services import smoke_service, smoke_detectors
+from app.services.smoke_job_service import smoke_job_queue
+from app.services.smoke_cluster_service import clusterer
+from app.services.alert_service import alert_broker
+from app.services.stats_service import rollup_refresher
+from app.services.partition_service import partition_maintainer
+from app.services.geofence_service import geofence_index
+from app.services.district_registry import district_registry
+from app.db import SessionLocal
+
+# Multipart framing on top of the image itself
+UPLOAD_OVERHEAD_BYTES = 64 * 1024
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app.state.http = httpx.AsyncClient(timeout=10)
+    alert_broker.bind(asyncio.get_running_loop())
+    await smoke_detectors.startup()
+    await smoke_job_queue.start()
+    try:
+        with SessionLocal() as db:
+            print(f"Smoke cluster index warmed with {clusterer.load(db)} active clusters")
+    except Exception as e:
+        print(f"Smoke cluster index warm-up skipped: {e}")
+    try:
+        with SessionLocal() as db:
+            print(f"Geofence index warmed with {geofence_index.load(db)} subscriptions")
+    except Exception as e:
+        print(f"Geofence index warm-up skipped: {e}")
+    try:
+        print(f"District registry loaded with {district_registry.load()} districts")
+    except Exception as e:
+        print(f"District registry not loaded: {e}")
+    await rollup_refresher.start()
+    await partition_maintainer.start()
     yield
+    await partition_maintainer.stop()
+    await rollup_refresher.stop()
+    await smoke_job_queue.stop()
     await app.state.http.aclose()
+    await smoke_detectors.shutdown()
 
 app = FastAPI(lifespan=lifespan)
+
+class UploadSizeLimitMiddleware:
+    """
+    Refuse oversized smoke uploads before the body is parsed: from
+    Content-Length when present, otherwise (chunked uploads) by counting body
+    bytes as they are received and aborting with 413 once over the limit.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith("/smoke/"):
+            await self.app(scope, receive, send)
+            return
+        max_bytes = smoke_service.SMOKE_MAX_UPLOAD_BYTES
+        if scope["path"] == "/smoke/detect_batch":
+            max_bytes *= smoke_service.SMOKE_BATCH_MAX_FILES
+        limit = max_bytes + UPLOAD_OVERHEAD_BYTES
+        too_large = JSONResponse(status_code=413, content={"detail": f"Upload too large (max {max_bytes} bytes)"})
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            await too_large(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def counting_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # HTTPException passes through FastAPI's body parsing unchanged
+                    raise HTTPException(status_code=413, detail=f"Upload too large (max {max_bytes} bytes)")
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, tracking_send)
+        except HTTPException as e:
+            if e.status_code != 413 or response_started:
+                raise
+            await too_large(scope, receive, send)
+
+app.add_middleware(UploadSizeLimitMiddleware)
+# Added last so it is outermost: 413s from the size limit still carry CORS headers
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
 # Include routers
@@ -28,5 +120,12 @@ def include_routers(app: FastAPI):
     app.include_router(fire_stations.router)
     app.include_router(auth.router)
     app.include_router(admin.router)
+    app.include_router(images.router)
+    app.include_router(alerts.router)
+    app.include_router(geofences.router)
+    app.include_router(sync.router)
+    app.include_router(batch.router)
+    app.include_router(export.router)
+    app.include_router(stats.router)
 
 include_routers(app)
@@ -4,6 +4,9 @@ from app.models.fire_station import FireStation
 from app.models.fire_incident import FireIncident
 from app.models.fire_report import FireReport
 from app.models.smoke_detection import SmokeDetection
+from app.models.smoke_cluster import SmokeCluster
+from app.models.daily_rollup import DailyRollup, RollupWatermark
+from app.models.geofence_subscription import GeofenceSubscription
 
-__all__ = ["User", "FireStation", "FireIncident", "FireReport", "SmokeDetection"]
+__all__ = ["User", "FireStation", "FireIncident", "FireReport", "SmokeDetection", "SmokeCluster", "DailyRollup", "RollupWatermark", "GeofenceSubscription"]
 
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Date, DateTime, Integer
+from datetime import datetime
+from app.db import Base
+
+class DailyRollup(Base):
+    """Row count per entity / district / created day / current status (see stats_service)."""
+    __tablename__ = "daily_rollups"
+    entity = Column(String(20), primary_key=True)
+    day = Column(Date, primary_key=True)
+    district = Column(String(255), primary_key=True)  # "" when the row has none
+    status = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class RollupWatermark(Base):
+    """Rows with updated_at after `watermark` are not yet folded into daily_rollups."""
+    __tablename__ = "rollup_watermarks"
+    entity = Column(String(20), primary_key=True)
+    watermark = Column(DateTime)
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
@@ -15,6 +15,9 @@ class FireIncident(Base):
     status = Column(String(20), default="active")
     reported_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     assigned_station_id = Column(UUID(as_uuid=True), ForeignKey("fire_stations.id"))
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # Soft delete: the row stays as a tombstone so /sync can report the deletion
+    deleted_at = Column(DateTime)
     reported_by_user = relationship("User", back_populates="fire_incidents")
     assigned_station = relationship("FireStation", back_populates="fire_incidents")
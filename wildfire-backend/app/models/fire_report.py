@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.db import Base
 
@@ -13,6 +13,11 @@ class FireReport(Base):
     location = Column(String)
     image_url = Column(String)
     status = Column(String, default="pending")
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # Soft delete: the row stays as a tombstone so /sync can report the deletion
+    deleted_at = Column(DateTime)
+    # Full-text index of title/description/location, maintained by a DB trigger
+    # (see migration a4c7e2f95d36); never loaded with the row
+    search_vector = deferred(Column(TSVECTOR()))
     user = relationship("User", back_populates="reports")
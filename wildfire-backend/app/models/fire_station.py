@@ -14,4 +14,7 @@ class FireStation(Base):
     longitude = Column(DECIMAL(11, 8))
     status = Column(String(20), default="available")
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # Soft delete: the row stays as a tombstone so /sync can report the deletion
+    deleted_at = Column(DateTime)
     fire_incidents = relationship("FireIncident", back_populates="assigned_station")
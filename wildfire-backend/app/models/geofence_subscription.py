@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, DateTime, DECIMAL, Integer, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import uuid
+from app.db import Base
+
+class GeofenceSubscription(Base):
+    """A user's alert area: a GeoJSON polygon, or a circle (center + radius_m)."""
+    __tablename__ = "geofence_subscriptions"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(100))
+    geometry = Column(JSON)
+    latitude = Column(DECIMAL(10, 8))
+    longitude = Column(DECIMAL(11, 8))
+    radius_m = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    user = relationship("User", back_populates="geofence_subscriptions")
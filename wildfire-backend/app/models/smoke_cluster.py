@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, DateTime, DECIMAL, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import uuid
+from app.db import Base
+
+class SmokeCluster(Base):
+    """Smoke detections close in space and time, treated as one fire."""
+    __tablename__ = "smoke_clusters"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
+    latitude = Column(DECIMAL(10, 8), nullable=False)
+    longitude = Column(DECIMAL(11, 8), nullable=False)
+    district = Column(String(100))
+    detection_count = Column(Integer, default=0)
+    max_risk_score = Column(DECIMAL(4, 3))
+    report_id = Column(Integer, ForeignKey("fire_reports.id"))
+    first_seen_at = Column(DateTime, default=datetime.utcnow)
+    last_seen_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    detections = relationship("SmokeDetection", back_populates="cluster")
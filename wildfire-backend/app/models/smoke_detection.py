@@ -1,16 +1,22 @@
-from sqlalchemy import Column, String, DateTime, DECIMAL, Text
+from sqlalchemy import Column, String, DateTime, DECIMAL, Text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
 from app.db import Base
 
 class SmokeDetection(Base):
     __tablename__ = "smoke_detections"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
+    # On PostgreSQL the table is range-partitioned by month on created_at and
+    # its primary key is (id, created_at); id alone is the ORM identity.
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     image_url = Column(Text, nullable=False)
     latitude = Column(DECIMAL(10, 8))
     longitude = Column(DECIMAL(11, 8))
     district = Column(String(100))
     risk_score = Column(DECIMAL(4, 3))
     status = Column(String(20), default="pending")
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    cluster_id = Column(UUID(as_uuid=True), ForeignKey("smoke_clusters.id"), index=True)
+    cluster = relationship("SmokeCluster", back_populates="detections")
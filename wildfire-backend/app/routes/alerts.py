@@ -0,0 +1,105 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Header, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from app.services.alert_service import alert_broker, parse_alert_filter, ALERT_HEARTBEAT_SECONDS
+from app.services.geofence_service import geofence_index
+from app.db import SessionLocal
+from app.utils.dependencies import resolve_user
+
+router = APIRouter(prefix="/alerts", tags=["Alerts"])
+
+
+def _stream_user_id(access_token: Optional[str], authorization: Optional[str] = None) -> Optional[str]:
+    """
+    Optional auth for streams: EventSource and browser WebSockets cannot set
+    headers, so the token may also come as ?access_token=. Raises ValueError
+    for a bad token or a deleted user; anonymous streams get only public alerts.
+    """
+    token = access_token
+    if not token and authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    if not token:
+        return None
+    # Resolved like get_current_user, but the session is not held open for the stream.
+    # Blocking DB access: the async handlers call this via asyncio.to_thread
+    with SessionLocal() as db:
+        user = resolve_user(db, token)
+        if user is None:
+            raise ValueError("Could not validate credentials")
+        return str(user.id)
+
+
+def _alert_filter(district: Optional[List[str]], bbox: Optional[str], user_id: Optional[str] = None):
+    try:
+        return parse_alert_filter(district, bbox, user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/stream")
+async def stream_alerts(
+    district: Optional[List[str]] = Query(None, description="İlçe filtresi (tekrarlanabilir ya da virgülle ayrılmış)"),
+    bbox: Optional[str] = Query(None, description="minLon,minLat,maxLon,maxLat"),
+    access_token: Optional[str] = Query(None, description="Giriş token'ı: bölge aboneliği uyarıları da gelir"),
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    authorization: Optional[str] = Header(None)
+):
+    """Yeni/güncellenen olaylar, yüksek riskli hücreler ve otomatik raporlar (server-sent events)"""
+    try:
+        user_id = await asyncio.to_thread(_stream_user_id, access_token, authorization)
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    alert_filter = _alert_filter(district, bbox, user_id)
+    return StreamingResponse(
+        alert_broker.events(alert_filter, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws")
+async def alerts_websocket(
+    websocket: WebSocket,
+    district: Optional[List[str]] = Query(None),
+    bbox: Optional[str] = Query(None),
+    access_token: Optional[str] = Query(None)
+):
+    """Aynı akış WebSocket üzerinden (EventSource olmayan mobil istemciler için)"""
+    try:
+        user_id = await asyncio.to_thread(_stream_user_id, access_token)
+        alert_filter = parse_alert_filter(district, bbox, user_id)
+    except ValueError:
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    subscription = alert_broker.subscribe(alert_filter)
+    # Client messages are ignored; receiving only notices the disconnect
+    receiver = asyncio.create_task(websocket.receive_text())
+    try:
+        while True:
+            getter = asyncio.create_task(subscription.queue.get())
+            done, _ = await asyncio.wait({getter, receiver}, timeout=ALERT_HEARTBEAT_SECONDS,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            # An alert already taken off the queue is sent even when a client
+            # message arrived in the same wakeup
+            if getter in done:
+                await websocket.send_json(getter.result())
+            else:
+                getter.cancel()
+            if receiver in done:
+                receiver.result()
+                receiver = asyncio.create_task(websocket.receive_text())
+            elif getter not in done:
+                await websocket.send_json({"type": "keep-alive"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        alert_broker.unsubscribe(subscription)
+
+
+@router.get("/stats")
+async def alert_stats():
+    """Bağlı istemci, tampondaki uyarı ve indeksteki bölge aboneliği sayısı"""
+    return {**alert_broker.stats(), "geofences": geofence_index.stats()}
@@ -14,7 +14,7 @@ async def register(
     db: Session = Depends(get_db)
 ):
     """Register a new user."""
-    user = register_user(db, user_data)
+    user = await register_user(db, user_data)
     return user
 
 
@@ -24,7 +24,7 @@ async def login(
     db: Session = Depends(get_db)
 ):
     """Login and get access token."""
-    result = login_user(db, login_data)
+    result = await login_user(db, login_data)
     return {
         "access_token": result["access_token"],
         "token_type": result["token_type"]
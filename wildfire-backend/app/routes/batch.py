@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.deps import get_db
+from app.schemas.batch import BatchRequest, BatchResponse
+from app.controllers import batch_controller
+
+router = APIRouter(tags=["Batch"])
+
+@router.post("/batch", response_model=BatchResponse)
+def apply_batch(data: BatchRequest, db: Session = Depends(get_db)):
+    """Olay/istasyon/rapor güncellemelerini tek transaction'da uygula (örn. dispatch)"""
+    return batch_controller.handle_apply_batch(db, data)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query
+from datetime import datetime
+from typing import Optional
+from app.controllers import export_controller
+from app.utils.dependencies import get_current_admin
+from app.models.user import User
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+@router.get("/{entity}")
+def export_entity(
+    entity: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: Optional[datetime] = Query(None, description="created_at >= since"),
+    until: Optional[datetime] = Query(None, description="created_at < until"),
+    bbox: Optional[str] = Query(None, description="minLon,minLat,maxLon,maxLat"),
+    current_admin: User = Depends(get_current_admin)
+):
+    """smoke_detections / fire_incidents / fire_reports tablosunun tamamını akış halinde dışa aktar (NDJSON ya da CSV) (Admin only)"""
+    return export_controller.handle_export(entity, format, since, until, bbox)
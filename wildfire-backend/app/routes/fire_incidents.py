@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, UploadFile, File, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from app.deps import get_db
-from app.schemas.fire_incident import FireIncidentCreate, FireIncidentUpdate, FireIncidentResponse
-from app.controllers import fire_incident_controller
+from app.utils.dependencies import get_current_admin, get_optional_user
+from app.models.user import User
+from app.schemas.bulk_import import ImportReport
+from app.services.import_service import IMPORT_CHUNK_SIZE
+from app.schemas.fire_incident import FireIncidentCreate, FireIncidentUpdate, FireIncidentResponse, FireIncidentExpandedResponse
+from app.controllers import import_controller, fire_incident_controller
 
 router = APIRouter(prefix="/fire-incidents", tags=["Fire Incidents"])
 
@@ -13,15 +17,39 @@ def create_fire_incident(data: FireIncidentCreate, db: Session = Depends(get_db)
     """Yeni yangın olayı oluştur"""
     return fire_incident_controller.handle_create_fire_incident(db, data)
 
-@router.get("", response_model=List[FireIncidentResponse])
-def get_fire_incidents(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Tüm yangın olaylarını getir"""
-    return fire_incident_controller.handle_get_fire_incidents(db, skip, limit)
+@router.post("/import", response_model=ImportReport)
+def import_incidents(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|geojson)$", description="Varsayılan: dosya uzantısından"),
+    chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=50000),
+    method: Optional[str] = Query(None, description="insert | copy (PostgreSQL'de varsayılan copy)"),
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """Yangın olaylarını GeoJSON/CSV dosyasından toplu içe aktar (Admin only)"""
+    return import_controller.handle_import(db, "incidents", file, format, chunk_size, method, dry_run)
 
-@router.get("/{incident_id}", response_model=FireIncidentResponse)
-def get_fire_incident(incident_id: UUID, db: Session = Depends(get_db)):
+@router.get("", response_model=List[FireIncidentExpandedResponse], response_model_exclude_unset=True)
+def get_fire_incidents(
+    skip: int = 0,
+    limit: int = 100,
+    expand: Optional[str] = Query(None, description="station,reporter (reporter: itfaiyeci/admin)"),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
+    """Tüm yangın olaylarını getir (expand ile istasyon/bildiren kişi gömülü)"""
+    return fire_incident_controller.handle_get_fire_incidents(db, skip, limit, expand, current_user)
+
+@router.get("/{incident_id}", response_model=FireIncidentExpandedResponse, response_model_exclude_unset=True)
+def get_fire_incident(
+    incident_id: UUID,
+    expand: Optional[str] = Query(None, description="station,reporter (reporter: itfaiyeci/admin)"),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
     """ID ile yangın olayı getir"""
-    return fire_incident_controller.handle_get_fire_incident(db, incident_id)
+    return fire_incident_controller.handle_get_fire_incident(db, incident_id, expand, current_user)
 
 @router.put("/{incident_id}", response_model=FireIncidentResponse)
 def update_fire_incident(incident_id: UUID, data: FireIncidentUpdate, db: Session = Depends(get_db)):
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.deps import get_db
-from app.schemas.fire_report import FireReportCreate, FireReportUpdate, FireReportResponse
+from app.schemas.fire_report import FireReportCreate, FireReportUpdate, FireReportResponse, FireReportSearchResponse
+from app.services.fire_report_service import FIRE_REPORT_SEARCH_LIMIT
 from app.controllers import fire_report_controller
 
 router = APIRouter(prefix="/fire-reports", tags=["Fire Reports"])
@@ -17,6 +18,17 @@ def get_fire_reports(skip: int = 0, limit: int = 100, db: Session = Depends(get_
     """Tüm yangın raporlarını getir"""
     return fire_report_controller.handle_get_fire_reports(db, skip, limit)
 
+@router.get("/search", response_model=FireReportSearchResponse)
+def search_fire_reports(
+    q: str = Query(..., min_length=1, description="Aranacak kelimeler (\"tırnak\", OR ve -hariç desteklenir)"),
+    limit: int = Query(FIRE_REPORT_SEARCH_LIMIT, description="Sayfa başına sonuç"),
+    cursor: Optional[str] = Query(None, description="Önceki yanıtın `next_cursor` değeri"),
+    sort: str = Query("rank", pattern="^(rank|recent)$", description="rank: alaka, recent: en yeni"),
+    db: Session = Depends(get_db)
+):
+    """Yangın raporlarında tam metin arama (başlık, açıklama, konum)"""
+    return fire_report_controller.handle_search_fire_reports(db, q, limit, cursor, sort)
+
 @router.get("/{report_id}", response_model=FireReportResponse)
 def get_fire_report(report_id: int, db: Session = Depends(get_db)):
     """ID ile yangın raporu getir"""
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, UploadFile, File, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from app.deps import get_db
+from app.utils.dependencies import get_current_admin
+from app.models.user import User
+from app.schemas.bulk_import import ImportReport
+from app.services.import_service import IMPORT_CHUNK_SIZE
 from app.schemas.fire_station import FireStationCreate, FireStationUpdate, FireStationResponse
-from app.controllers import fire_station_controller
+from app.controllers import import_controller, fire_station_controller
 
 router = APIRouter(prefix="/fire-stations", tags=["Fire Stations"])
 
@@ -13,6 +17,19 @@ def create_fire_station(data: FireStationCreate, db: Session = Depends(get_db)):
     """Yeni itfaiye istasyonu oluştur"""
     return fire_station_controller.handle_create_fire_station(db, data)
 
+@router.post("/import", response_model=ImportReport)
+def import_stations(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|geojson)$", description="Varsayılan: dosya uzantısından"),
+    chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=50000),
+    method: Optional[str] = Query(None, description="insert | copy (PostgreSQL'de varsayılan copy)"),
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """İtfaiye istasyonlarını GeoJSON/CSV dosyasından toplu içe aktar (Admin only)"""
+    return import_controller.handle_import(db, "stations", file, format, chunk_size, method, dry_run)
+
 @router.get("", response_model=List[FireStationResponse])
 def get_fire_stations(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Tüm itfaiye istasyonlarını getir"""
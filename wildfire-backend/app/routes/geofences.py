@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import List
+from uuid import UUID
+from app.deps import get_db
+from app.models.user import User
+from app.schemas.geofence import GeofenceSubscriptionCreate, GeofenceSubscriptionResponse
+from app.controllers import geofence_controller
+from app.utils.dependencies import get_current_user
+
+router = APIRouter(prefix="/alerts/subscriptions", tags=["Alerts"])
+
+@router.post("", response_model=GeofenceSubscriptionResponse)
+def create_subscription(
+    data: GeofenceSubscriptionCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Bölge aboneliği oluştur: alan içindeki yeni olaylar kullanıcının akışına gelir"""
+    return geofence_controller.handle_create_subscription(db, current_user, data)
+
+@router.get("", response_model=List[GeofenceSubscriptionResponse])
+def get_subscriptions(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Kendi bölge aboneliklerim"""
+    return geofence_controller.handle_get_subscriptions(db, current_user)
+
+@router.delete("/{subscription_id}")
+def delete_subscription(
+    subscription_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Bölge aboneliğini sil"""
+    return geofence_controller.handle_delete_subscription(db, current_user, subscription_id)
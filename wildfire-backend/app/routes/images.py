@@ -0,0 +1,33 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse
+from app.services import image_store
+
+router = APIRouter(prefix="/images", tags=["Images"])
+
+# Content-addressed: a URL never changes content
+IMMUTABLE_CACHE_HEADERS = {"Cache-Control": "public, max-age=31536000, immutable"}
+
+
+@router.get("/{digest}")
+async def get_image(digest: str):
+    """Yüklenen görüntüyü getir (Range destekli, dosya belleğe okunmadan gönderilir)"""
+    if not image_store.is_valid_digest(digest):
+        raise HTTPException(status_code=404, detail="Image not found")
+    found = image_store.find_image(digest)
+    if not found:
+        raise HTTPException(status_code=404, detail="Image not found")
+    path, media_type = found
+    return FileResponse(path, media_type=media_type, headers=IMMUTABLE_CACHE_HEADERS)
+
+
+@router.get("/{digest}/thumbnail")
+async def get_image_thumbnail(digest: str, size: int = Query(256, description="128, 256 veya 512 px")):
+    """Görüntünün küçük önizlemesi (ilk istekte oluşturulur, diskte saklanır)"""
+    if size not in image_store.THUMBNAIL_SIZES:
+        raise HTTPException(status_code=400, detail=f"size must be one of {list(image_store.THUMBNAIL_SIZES)}")
+    if not image_store.is_valid_digest(digest):
+        raise HTTPException(status_code=404, detail="Image not found")
+    path = await image_store.get_thumbnail(digest, size)
+    if not path:
+        raise HTTPException(status_code=404, detail="Image not found")
+    return FileResponse(path, media_type="image/jpeg", headers=IMMUTABLE_CACHE_HEADERS)
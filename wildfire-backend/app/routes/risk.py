@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from app.models.risk import PolygonRequest, RiskResponse
-from app.services.risk_service import get_risk_nowcast_for_polygon_service
+from app.services.risk_service import get_risk_nowcast_for_polygon_service, get_risk_nowcast_for_district_service
+from app.services.district_registry import district_registry
 from app.deps import get_db
 
 router = APIRouter()
@@ -20,3 +21,24 @@ async def get_risk_nowcast_for_polygon(
     """
     return await get_risk_nowcast_for_polygon_service(polygon_request, hourOffset, provider, version, db)
 
+@router.get("/risk/districts")
+def get_districts():
+    """Sunucuda kayıtlı ilçeler (nowcast_by_district için id'ler)"""
+    return [district.summary() for district in district_registry.all()]
+
+@router.post("/risk/nowcast_by_district/{district_id}", response_model=RiskResponse)
+async def get_risk_nowcast_for_district(
+    district_id: str,
+    hourOffset: int = 0,
+    provider: str = "hyper_model_vpd",
+    version: int = 7,
+    db: Session = Depends(get_db)
+):
+    """
+    nowcast_by_polygon ile aynı hesap, geometri gövdede gönderilmeden:
+    ilçenin grid'i açılışta hazırlanır.
+    """
+    district = district_registry.get(district_id)
+    if district is None:
+        raise HTTPException(status_code=404, detail=f"Unknown district: {district_id}")
+    return await get_risk_nowcast_for_district_service(district, hourOffset, provider, version, db)
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
-from app.services.smoke_service import detect_smoke_service
+from app.services.smoke_service import detect_smoke_service, detect_smoke_batch_service
 from app.deps import get_db
-from app.schemas.smoke_detection import SmokeDetectionResponse
-from app.controllers import smoke_detection_controller
+from app.schemas.smoke_detection import SmokeDetectionResponse, SmokeClusterResponse
+from app.services.smoke_job_service import smoke_job_queue
+from app.services import camera_service
+from app.controllers import smoke_detection_controller, smoke_cluster_controller
 
 router = APIRouter(tags=["Smoke Detection"])
 
@@ -15,6 +18,7 @@ async def detect_smoke(
     latitude: Optional[float] = Query(None, description="Tespit konumu - enlem"),
     longitude: Optional[float] = Query(None, description="Tespit konumu - boylam"),
     district: Optional[str] = Query(None, description="İlçe/bölge adı"),
+    tiled: Optional[bool] = Query(None, description="Büyük görüntüyü örtüşen parçalara bölerek analiz et"),
     db: Session = Depends(get_db)
 ):
     """
@@ -25,10 +29,115 @@ async def detect_smoke(
     - Risk > 50% ise otomatik fire_report oluşturur
     """
     try:
-        return await detect_smoke_service(file, db, latitude, longitude, district)
+        return await detect_smoke_service(file, db, latitude, longitude, district, tiled)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Smoke detection failed: {str(e)}")
 
+@router.post("/smoke/detect_batch")
+async def detect_smoke_batch(
+    files: List[UploadFile] = File(...),
+    latitude: Optional[float] = Query(None, description="Tespit konumu - enlem"),
+    longitude: Optional[float] = Query(None, description="Tespit konumu - boylam"),
+    district: Optional[str] = Query(None, description="İlçe/bölge adı"),
+    tiled: Optional[bool] = Query(None, description="Büyük görüntüyü örtüşen parçalara bölerek analiz et"),
+    db: Session = Depends(get_db)
+):
+    """
+    Aynı konumdan çoklu fotoğraf ile duman tespiti
+    
+    - Fotoğraflar eşzamanlı (sınırlı) analiz edilir
+    - Tüm kayıtlar tek transaction'da toplu eklenir
+    - Sonuçlar fotoğraf bazında döner
+    """
+    try:
+        return await detect_smoke_batch_service(files, db, latitude, longitude, district, tiled)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Smoke detection failed: {str(e)}")
+
+@router.post("/smoke/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_smoke_job(
+    file: UploadFile = File(...),
+    latitude: Optional[float] = Query(None, description="Tespit konumu - enlem"),
+    longitude: Optional[float] = Query(None, description="Tespit konumu - boylam"),
+    district: Optional[str] = Query(None, description="İlçe/bölge adı"),
+    tiled: Optional[bool] = Query(None, description="Büyük görüntüyü örtüşen parçalara bölerek analiz et"),
+):
+    """
+    Asenkron duman tespiti
+    
+    - Fotoğrafı kuyruğa alır, hemen 202 + job_id döner
+    - Sonuç GET /smoke/jobs/{job_id} veya /smoke/jobs/{job_id}/events (SSE) ile alınır
+    """
+    job = await smoke_job_queue.submit(file, latitude, longitude, district, tiled)
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/smoke/jobs/{job.id}",
+        "events_url": f"/smoke/jobs/{job.id}/events",
+        **smoke_job_queue.stats()
+    }
+
+@router.get("/smoke/jobs")
+async def get_smoke_job_stats():
+    """Kuyruk durumu (worker sayısı, bekleyen iş sayısı)"""
+    return smoke_job_queue.stats()
+
+@router.get("/smoke/jobs/{job_id}")
+async def get_smoke_job(job_id: str):
+    """Asenkron duman tespiti sonucunu getir"""
+    job = smoke_job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Smoke job not found")
+    return job.to_dict()
+
+@router.get("/smoke/jobs/{job_id}/events")
+async def stream_smoke_job(job_id: str):
+    """Asenkron duman tespiti durumunu server-sent events ile takip et"""
+    job = smoke_job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Smoke job not found")
+    return StreamingResponse(
+        smoke_job_queue.events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/smoke/cameras/{camera_id}/frames")
+async def ingest_camera_frame(
+    camera_id: str,
+    file: UploadFile = File(...),
+    latitude: Optional[float] = Query(None, description="Kamera konumu - enlem"),
+    longitude: Optional[float] = Query(None, description="Kamera konumu - boylam"),
+    district: Optional[str] = Query(None, description="İlçe/bölge adı"),
+    db: Session = Depends(get_db)
+):
+    """
+    Gözetleme kulesi kamerasından kare al
+    
+    - Son analiz edilen kareyle algısal hash karşılaştırılır
+    - Sahne değişmediyse AI çağrılmaz, son sonuç döner
+    - smoke_detections'a sadece değişiklikler kaydedilir: ilk kare, sahnesi değişen kare ya da
+      periyodik yeniden analizde risk seviyesi (confirmed/pending) değişen kare
+    """
+    try:
+        return await camera_service.ingest_camera_frame(camera_id, file, db, latitude, longitude, district)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Camera frame ingestion failed: {str(e)}")
+
+@router.get("/smoke/cameras/{camera_id}")
+async def get_camera_state(camera_id: str):
+    """Kameranın son analiz durumu"""
+    state = camera_service.get_camera_state(camera_id)
+    if not state:
+        raise HTTPException(status_code=404, detail="Camera not found")
+    return state.to_dict()
+
 @router.get("/smoke/detections", response_model=List[SmokeDetectionResponse])
 def get_smoke_detections(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Tüm duman tespitlerini getir"""
@@ -38,3 +147,23 @@ def get_smoke_detections(skip: int = 0, limit: int = 100, db: Session = Depends(
 def get_smoke_detection(detection_id: UUID, db: Session = Depends(get_db)):
     """ID ile duman tespiti getir"""
     return smoke_detection_controller.handle_get_smoke_detection(db, detection_id)
+
+@router.get("/smoke/clusters", response_model=List[SmokeClusterResponse])
+def get_smoke_clusters(
+    skip: int = 0,
+    limit: int = 100,
+    active: bool = Query(False, description="Sadece zaman penceresi içindeki kümeler"),
+    db: Session = Depends(get_db)
+):
+    """Duman kümelerini getir (aynı yangına ait tespitler)"""
+    return smoke_cluster_controller.handle_get_smoke_clusters(db, skip, limit, active)
+
+@router.get("/smoke/clusters/{cluster_id}", response_model=SmokeClusterResponse)
+def get_smoke_cluster(cluster_id: UUID, db: Session = Depends(get_db)):
+    """ID ile duman kümesi getir"""
+    return smoke_cluster_controller.handle_get_smoke_cluster(db, cluster_id)
+
+@router.get("/smoke/clusters/{cluster_id}/detections", response_model=List[SmokeDetectionResponse])
+def get_smoke_cluster_detections(cluster_id: UUID, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    """Kümeye ait duman tespitleri"""
+    return smoke_cluster_controller.handle_get_cluster_detections(db, cluster_id, skip, limit)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import Optional
+from app.deps import get_db
+from app.models.user import User
+from app.schemas.stats import DailyStatsResponse, DistrictStatsResponse, RefreshResponse
+from app.controllers import stats_controller
+from app.utils.dependencies import get_current_admin
+
+router = APIRouter(prefix="/stats", tags=["Stats"])
+
+@router.get("/{entity}/daily", response_model=DailyStatsResponse)
+def get_daily_stats(
+    entity: str,
+    since: Optional[date] = Query(None, description="İlk gün (dahil)"),
+    until: Optional[date] = Query(None, description="Son gün (dahil)"),
+    district: Optional[str] = Query(None, description="Tek ilçe"),
+    db: Session = Depends(get_db)
+):
+    """incidents / detections / reports için gün ve durum bazında sayılar (günlük özet tablosundan)"""
+    return stats_controller.handle_get_daily_stats(db, entity, since, until, district)
+
+@router.get("/{entity}/districts", response_model=DistrictStatsResponse)
+def get_district_stats(
+    entity: str,
+    since: Optional[date] = Query(None, description="İlk gün (dahil)"),
+    until: Optional[date] = Query(None, description="Son gün (dahil)"),
+    db: Session = Depends(get_db)
+):
+    """Tarih aralığında ilçe ve durum bazında sayılar"""
+    return stats_controller.handle_get_district_stats(db, entity, since, until)
+
+@router.post("/refresh", response_model=RefreshResponse)
+def refresh_stats(
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """Özet tablolarını hemen güncelle (sadece admin)"""
+    return stats_controller.handle_refresh(db)
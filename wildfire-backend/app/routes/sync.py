@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.deps import get_db
+from app.schemas.sync import SyncResponse
+from app.services.sync_service import SYNC_PAGE_LIMIT
+from app.controllers import sync_controller
+
+router = APIRouter(tags=["Sync"])
+
+@router.get("/sync", response_model=SyncResponse)
+def get_changes(
+    since: Optional[str] = Query(None, description="Önceki yanıtın `cursor` değeri; boşsa tam liste"),
+    limit: int = Query(SYNC_PAGE_LIMIT, description="Sayfa başına en fazla satır"),
+    tables: Optional[str] = Query(None, description="Virgülle ayrılmış tablo listesi (varsayılan: hepsi)"),
+    db: Session = Depends(get_db)
+):
+    """İstasyon, olay, rapor ve duman tespitlerinde `since` sonrası değişenler (silinenler tombstone olarak)"""
+    return sync_controller.handle_get_changes(db, since, limit, tables)
@@ -46,5 +46,5 @@ class UserUpdate(BaseModel):
 
 class UserListResponse(BaseModel):
     users: list[UserResponse]
-    total: int
+    total: Optional[int] = None  # None for a page past the end
 
@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import Annotated, List, Literal, Optional, Union
+from uuid import UUID
+from app.schemas.fire_incident import FireIncidentUpdate, FireIncidentResponse
+from app.schemas.fire_report import FireReportUpdate, FireReportResponse
+from app.schemas.fire_station import FireStationUpdate, FireStationResponse
+
+# Request schemas
+# `expect`: current values the locked row must still have, otherwise the whole
+# batch is rolled back with 409 (e.g. station status "available" on dispatch)
+class FireIncidentOperation(BaseModel):
+    entity: Literal["fire_incident"]
+    id: UUID
+    data: FireIncidentUpdate
+    expect: Optional[FireIncidentUpdate] = None
+
+class FireStationOperation(BaseModel):
+    entity: Literal["fire_station"]
+    id: UUID
+    data: FireStationUpdate
+    expect: Optional[FireStationUpdate] = None
+
+class FireReportOperation(BaseModel):
+    entity: Literal["fire_report"]
+    id: int
+    data: FireReportUpdate
+    expect: Optional[FireReportUpdate] = None
+
+BatchOperation = Annotated[
+    Union[FireIncidentOperation, FireStationOperation, FireReportOperation],
+    Field(discriminator="entity")
+]
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1)
+
+# Response schemas
+class BatchResult(BaseModel):
+    entity: str
+    id: Union[UUID, int]
+    data: Union[FireIncidentResponse, FireStationResponse, FireReportResponse]
+
+class BatchResponse(BaseModel):
+    success: bool
+    results: List[BatchResult]
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List
+
+# Response schemas
+class ImportRowError(BaseModel):
+    row: int  # CSV line number / GeoJSON feature index
+    errors: List[str]
+
+class ImportReport(BaseModel):
+    entity: str
+    format: str
+    method: str
+    dry_run: bool
+    processed: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool
+    duration_ms: float
@@ -33,6 +33,31 @@ class FireIncidentResponse(BaseModel):
     reported_by: Optional[UUID] = None
     assigned_station_id: Optional[UUID] = None
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+class StationSummary(BaseModel):
+    id: UUID
+    name: str
+    district: str
+    status: str
+    latitude: Optional[Decimal] = None
+    longitude: Optional[Decimal] = None
+
+    class Config:
+        from_attributes = True
+
+class ReporterSummary(BaseModel):
+    id: UUID
+    full_name: Optional[str] = None
+    role: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+# `station` / `reporter` are only present when requested with ?expand=
+class FireIncidentExpandedResponse(FireIncidentResponse):
+    station: Optional[StationSummary] = None
+    reporter: Optional[ReporterSummary] = None
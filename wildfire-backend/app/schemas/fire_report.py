@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -27,8 +27,17 @@ class FireReportResponse(BaseModel):
     location: Optional[str] = None
     image_url: Optional[str] = None
     status: str
-    created_at: datetime
+    created_at: Optional[datetime] = None  # eski kayıtlarda boş olabilir
     updated_at: datetime
 
     class Config:
         from_attributes = True  # SQLAlchemy model -> Pydantic
+
+
+class FireReportSearchHit(BaseModel):
+    report: FireReportResponse
+    rank: float
+
+class FireReportSearchResponse(BaseModel):
+    items: List[FireReportSearchHit]
+    next_cursor: Optional[str] = None
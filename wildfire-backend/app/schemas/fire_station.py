@@ -28,6 +28,7 @@ class FireStationResponse(BaseModel):
     longitude: Optional[Decimal] = None
     status: str
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
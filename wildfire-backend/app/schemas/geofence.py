@@ -0,0 +1,36 @@
+from pydantic import BaseModel, model_validator
+from typing import Any, Dict, Optional
+from datetime import datetime
+from uuid import UUID
+
+# Request schemas
+class GeofenceSubscriptionCreate(BaseModel):
+    """Bir GeoJSON Polygon/MultiPolygon ya da merkez + yarıçap (metre)"""
+    name: Optional[str] = None
+    geometry: Optional[Dict[str, Any]] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    radius_m: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_area(self):
+        circle = (self.latitude, self.longitude, self.radius_m)
+        if self.geometry is not None and any(value is not None for value in circle):
+            raise ValueError("Give either geometry or latitude/longitude/radius_m, not both")
+        if self.geometry is None and any(value is None for value in circle):
+            raise ValueError("geometry or latitude, longitude and radius_m are required")
+        return self
+
+# Response schemas
+class GeofenceSubscriptionResponse(BaseModel):
+    id: UUID
+    user_id: UUID
+    name: Optional[str] = None
+    geometry: Optional[Dict[str, Any]] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    radius_m: Optional[int] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True  # SQLAlchemy model -> Pydantic
@@ -22,7 +22,23 @@ class SmokeDetectionResponse(BaseModel):
     district: Optional[str] = None
     risk_score: Optional[Decimal] = None
     status: str
+    cluster_id: Optional[UUID] = None
     created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class SmokeClusterResponse(BaseModel):
+    id: UUID
+    latitude: Decimal
+    longitude: Decimal
+    district: Optional[str] = None
+    detection_count: int
+    max_risk_score: Optional[Decimal] = None
+    report_id: Optional[int] = None
+    first_seen_at: datetime
+    last_seen_at: datetime
 
     class Config:
         from_attributes = True
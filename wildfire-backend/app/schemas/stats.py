@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import date, datetime
+
+# Response schemas
+class DailyCount(BaseModel):
+    day: date
+    status: str
+    count: int
+
+class DistrictCount(BaseModel):
+    district: Optional[str] = None
+    status: str
+    count: int
+
+class DailyStatsResponse(BaseModel):
+    entity: str
+    refreshed_at: Optional[datetime] = None
+    items: List[DailyCount]
+
+class DistrictStatsResponse(BaseModel):
+    entity: str
+    refreshed_at: Optional[datetime] = None
+    items: List[DistrictCount]
+
+class RefreshResponse(BaseModel):
+    refreshed_days: Dict[str, int]
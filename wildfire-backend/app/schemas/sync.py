@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import List, Optional, Union
+from datetime import datetime
+from uuid import UUID
+from app.schemas.fire_incident import FireIncidentResponse
+from app.schemas.fire_report import FireReportResponse
+from app.schemas.fire_station import FireStationResponse
+from app.schemas.smoke_detection import SmokeDetectionResponse
+
+# Response schemas
+class Tombstone(BaseModel):
+    id: Union[UUID, int]
+    deleted_at: datetime
+
+class FireStationChanges(BaseModel):
+    upserted: List[FireStationResponse] = []
+    deleted: List[Tombstone] = []
+
+class FireIncidentChanges(BaseModel):
+    upserted: List[FireIncidentResponse] = []
+    deleted: List[Tombstone] = []
+
+class FireReportChanges(BaseModel):
+    upserted: List[FireReportResponse] = []
+    deleted: List[Tombstone] = []
+
+class SmokeDetectionChanges(BaseModel):
+    upserted: List[SmokeDetectionResponse] = []
+    deleted: List[Tombstone] = []
+
+class SyncResponse(BaseModel):
+    cursor: str
+    has_more: bool
+    server_time: datetime
+    fire_stations: Optional[FireStationChanges] = None
+    fire_incidents: Optional[FireIncidentChanges] = None
+    fire_reports: Optional[FireReportChanges] = None
+    smoke_detections: Optional[SmokeDetectionChanges] = None
@@ -0,0 +1,201 @@
+import asyncio
+import itertools
+import json
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, Deque, FrozenSet, List, Optional, Set, Tuple
+
+from app.utils.cache import TTLCache
+from app.utils.geo import BBox, parse_bbox
+
+# Per-subscriber buffer; a client that falls this far behind loses its oldest alerts
+ALERT_SUBSCRIBER_QUEUE_SIZE = int(os.getenv("ALERT_SUBSCRIBER_QUEUE_SIZE", "100"))
+# Recent alerts kept for reconnecting clients (Last-Event-ID)
+ALERT_REPLAY_SIZE = int(os.getenv("ALERT_REPLAY_SIZE", "200"))
+ALERT_HEARTBEAT_SECONDS = float(os.getenv("ALERT_HEARTBEAT_SECONDS", "15"))
+# The same district's high-risk cell is re-announced at most this often
+ALERT_RISK_REPEAT_SECONDS = float(os.getenv("ALERT_RISK_REPEAT_SECONDS", "600"))
+
+
+@dataclass(frozen=True)
+class AlertFilter:
+    """
+    District names (case-insensitive) and/or a (min_lon, min_lat, max_lon, max_lat)
+    box. `user_id` is set for authenticated streams: they also receive the
+    alerts addressed to that user (geofence matches).
+    """
+    districts: FrozenSet[str] = frozenset()
+    bbox: Optional[BBox] = None
+    user_id: Optional[str] = None
+
+    def matches(self, alert: dict, recipients: Optional[FrozenSet[str]] = None) -> bool:
+        if recipients is not None:
+            # Addressed alerts already carry their own area; stream filters do not apply
+            return self.user_id is not None and self.user_id in recipients
+        if self.districts and (alert.get("district") or "").lower() not in self.districts:
+            return False
+        if self.bbox:
+            lat, lon = alert.get("latitude"), alert.get("longitude")
+            if lat is None or lon is None:
+                return False
+            min_lon, min_lat, max_lon, max_lat = self.bbox
+            if not (min_lon <= lon <= max_lon and min_lat <= lat <= max_lat):
+                return False
+        return True
+
+
+@dataclass(eq=False)
+class Subscription:
+    filter: AlertFilter
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(ALERT_SUBSCRIBER_QUEUE_SIZE))
+    dropped: int = 0
+
+
+class AlertBroker:
+    """
+    In-process pub/sub for the alert stream. Services publish from any thread
+    (sync route handlers run in the threadpool); delivery happens on the event
+    loop, where each subscriber's filter is applied before queueing. Slow
+    subscribers drop their oldest alerts instead of blocking publishers.
+    Single process only: with several workers each one streams its own writes.
+    """
+
+    def __init__(self, replay_size: int = ALERT_REPLAY_SIZE):
+        self._subscribers: Set[Subscription] = set()
+        self._recent: Deque[Tuple[dict, Optional[FrozenSet[str]]]] = deque(maxlen=replay_size)
+        self._ids = itertools.count(1)
+        self._id_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def stats(self) -> dict:
+        return {"subscribers": len(self._subscribers), "buffered": len(self._recent)}
+
+    def publish(self, alert_type: str, payload: dict, district: Optional[str] = None,
+                latitude=None, longitude=None, recipients: Optional[FrozenSet[str]] = None) -> None:
+        """
+        Fire-and-forget; safe to call after commit from sync or async code.
+        With `recipients` (user ids) only those users' authenticated streams get it.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        with self._id_lock:
+            alert_id = next(self._ids)
+        alert = {
+            "id": alert_id,
+            "type": alert_type,
+            "district": district,
+            "latitude": float(latitude) if latitude is not None else None,
+            "longitude": float(longitude) if longitude is not None else None,
+            "created_at": datetime.utcnow().isoformat(),
+            "data": payload
+        }
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(alert, recipients)
+        else:
+            loop.call_soon_threadsafe(self._deliver, alert, recipients)
+
+    def _deliver(self, alert: dict, recipients: Optional[FrozenSet[str]] = None) -> None:
+        self._recent.append((alert, recipients))
+        for subscription in list(self._subscribers):
+            if not subscription.filter.matches(alert, recipients):
+                continue
+            if subscription.queue.full():
+                subscription.queue.get_nowait()
+                subscription.dropped += 1
+            subscription.queue.put_nowait(alert)
+
+    def subscribe(self, alert_filter: AlertFilter, last_event_id: Optional[int] = None) -> Subscription:
+        subscription = Subscription(filter=alert_filter)
+        if last_event_id is not None:
+            for alert, recipients in self._recent:
+                if alert["id"] > last_event_id and alert_filter.matches(alert, recipients):
+                    if subscription.queue.full():
+                        subscription.queue.get_nowait()
+                    subscription.queue.put_nowait(alert)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    async def events(self, alert_filter: AlertFilter, last_event_id: Optional[int] = None) -> AsyncIterator[str]:
+        """Server-sent events: one `alert` event per matching alert, with keep-alives."""
+        subscription = self.subscribe(alert_filter, last_event_id)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    alert = await asyncio.wait_for(subscription.queue.get(), ALERT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {alert['id']}\nevent: alert\ndata: {json.dumps(alert, default=str)}\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+
+alert_broker = AlertBroker()
+
+
+def parse_alert_filter(districts: Optional[List[str]] = None, bbox: Optional[str] = None,
+                       user_id: Optional[str] = None) -> AlertFilter:
+    """?district=a&district=b&bbox=minLon,minLat,maxLon,maxLat -> AlertFilter (ValueError if malformed)"""
+    names = frozenset(
+        name.strip().lower()
+        for value in districts or []
+        for name in value.split(",")
+        if name.strip()
+    )
+    return AlertFilter(districts=names, bbox=parse_bbox(bbox) if bbox else None, user_id=user_id)
+
+
+def incident_payload(incident, source: str = "api") -> dict:
+    return {
+        "id": str(incident.id),
+        "address": incident.address,
+        "district": incident.district,
+        "latitude": float(incident.latitude) if incident.latitude is not None else None,
+        "longitude": float(incident.longitude) if incident.longitude is not None else None,
+        "status": incident.status,
+        "assigned_station_id": str(incident.assigned_station_id) if incident.assigned_station_id else None,
+        "created_at": incident.created_at.isoformat() if incident.created_at else None,
+        "source": source
+    }
+
+
+def publish_incident_payload(alert_type: str, payload: dict) -> None:
+    """For payloads captured before commit (avoids reloading expired rows)."""
+    alert_broker.publish(alert_type, payload, payload["district"], payload["latitude"], payload["longitude"])
+
+
+def publish_incident(alert_type: str, incident, source: str = "api") -> None:
+    publish_incident_payload(alert_type, incident_payload(incident, source))
+
+
+_recent_risk_alerts = TTLCache(maxsize=10000, ttl=ALERT_RISK_REPEAT_SECONDS)
+# publish_high_risk is synchronous and may run on worker threads: the lock keeps
+# two concurrent nowcasts from both passing the check and announcing one district
+_risk_alert_lock = threading.Lock()
+
+
+def publish_high_risk(district: str, latitude: float, longitude: float, risk: float) -> None:
+    """risk.high for a nowcast cell above the incident threshold, deduplicated per district."""
+    with _risk_alert_lock:
+        previous = _recent_risk_alerts.get(district)
+        if previous is not None and previous >= risk:
+            return
+        _recent_risk_alerts.set(district, risk)
+    alert_broker.publish(
+        "risk.high", {"risk": round(risk, 3), "district": district}, district, latitude, longitude
+    )
@@ -2,11 +2,11 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.auth import UserCreate, UserLogin
-from app.utils.security import verify_password, get_password_hash, create_access_token
+from app.utils.security import verify_password_async, get_password_hash_async, create_access_token
 from datetime import timedelta
 
 
-def register_user(db: Session, user_data: UserCreate) -> User:
+async def register_user(db: Session, user_data: UserCreate) -> User:
     """Register a new user."""
     # Check if user already exists
     existing_user = db.query(User).filter(User.email == user_data.email).first()
@@ -22,7 +22,7 @@ def register_user(db: Session, user_data: UserCreate) -> User:
         user_data.role = "citizen"
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = User(
         email=user_data.email,
         password_hash=hashed_password,
@@ -37,7 +37,7 @@ def register_user(db: Session, user_data: UserCreate) -> User:
     return db_user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> User:
+async def authenticate_user(db: Session, email: str, password: str) -> User:
     """Authenticate user and return user if credentials are valid."""
     user = db.query(User).filter(User.email == email).first()
     if not user:
@@ -46,7 +46,7 @@ def authenticate_user(db: Session, email: str, password: str) -> User:
             detail="Incorrect email or password"
         )
     
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -55,9 +55,9 @@ def authenticate_user(db: Session, email: str, password: str) -> User:
     return user
 
 
-def login_user(db: Session, login_data: UserLogin) -> dict:
+async def login_user(db: Session, login_data: UserLogin) -> dict:
     """Login user and return access token."""
-    user = authenticate_user(db, login_data.email, login_data.password)
+    user = await authenticate_user(db, login_data.email, login_data.password)
     
     # Create access token
     access_token_expires = timedelta(minutes=60 * 24 * 7)  # 7 days
@@ -0,0 +1,100 @@
+import os
+from typing import List
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.models.fire_incident import FireIncident
+from app.models.fire_report import FireReport
+from app.models.fire_station import FireStation
+from app.schemas.fire_incident import FireIncidentResponse
+from app.schemas.fire_report import FireReportResponse
+from app.schemas.fire_station import FireStationResponse
+from app.services.alert_service import incident_payload, publish_incident_payload
+
+BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", "100"))
+
+# Rows are locked table by table in this fixed order (ids sorted within a
+# table), so two batches touching the same rows cannot deadlock.
+BATCH_ENTITIES = {
+    "fire_station": (FireStation, FireStationResponse),
+    "fire_incident": (FireIncident, FireIncidentResponse),
+    "fire_report": (FireReport, FireReportResponse),
+}
+
+
+def _lock_rows(db: Session, operations) -> dict:
+    """SELECT ... FOR UPDATE every target row -> {(entity, id): row}"""
+    locked = {}
+    for entity, (model, _) in BATCH_ENTITIES.items():
+        ids = sorted({operation.id for operation in operations if operation.entity == entity}, key=str)
+        if not ids:
+            continue
+        rows = (
+            db.query(model)
+            .filter(model.id.in_(ids), model.deleted_at.is_(None))
+            .order_by(model.id)
+            .with_for_update()
+            .all()
+        )
+        locked.update({(entity, row.id): row for row in rows})
+    return locked
+
+
+def _conflicts(row, expect) -> dict:
+    expected = expect.model_dump(exclude_unset=True) if expect else {}
+    return {
+        key: {"expected": value, "actual": getattr(row, key)}
+        for key, value in expected.items()
+        if getattr(row, key) != value
+    }
+
+
+def apply_batch(db: Session, operations: List) -> List[dict]:
+    """
+    Apply incident/station/report updates in one transaction: lock the rows,
+    check `expect` preconditions, apply in request order, commit once.
+    Any missing row or failed precondition rolls back the whole batch.
+    """
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_OPERATIONS} operations per batch")
+
+    try:
+        locked = _lock_rows(db, operations)
+        for index, operation in enumerate(operations):
+            row = locked.get((operation.entity, operation.id))
+            if row is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail={"operation": index, "message": f"{operation.entity} {operation.id} not found"}
+                )
+            conflicts = _conflicts(row, operation.expect)
+            if conflicts:
+                raise HTTPException(
+                    status_code=409,
+                    detail={"operation": index, "message": "Precondition failed", "conflicts": jsonable_encoder(conflicts)}
+                )
+            for key, value in operation.data.model_dump(exclude_unset=True).items():
+                setattr(row, key, value)
+
+        # Flush stamps updated_at; serialize now so commit needs no reload
+        db.flush()
+        results = []
+        for operation in operations:
+            _, response_model = BATCH_ENTITIES[operation.entity]
+            row = locked[(operation.entity, operation.id)]
+            results.append({"entity": operation.entity, "id": row.id, "data": response_model.model_validate(row)})
+        alerts = [
+            incident_payload(row)
+            for (entity, _), row in locked.items()
+            if entity == "fire_incident"
+        ]
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for payload in alerts:
+        publish_incident_payload("incident.updated", payload)
+    return results
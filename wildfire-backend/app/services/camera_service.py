@@ -0,0 +1,152 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+
+from app.services import smoke_service
+from app.utils.cache import TTLCache
+
+# A frame is re-analyzed when its perceptual hash differs from the last analyzed
+# frame by more than this many bits (out of 64), or when the interval elapsed.
+SMOKE_CAMERA_PHASH_THRESHOLD = int(os.getenv("SMOKE_CAMERA_PHASH_THRESHOLD", "6"))
+SMOKE_CAMERA_MAX_INTERVAL_SECONDS = float(os.getenv("SMOKE_CAMERA_MAX_INTERVAL_SECONDS", "300"))
+SMOKE_CAMERA_MAX_CAMERAS = int(os.getenv("SMOKE_CAMERA_MAX_CAMERAS", "10000"))
+HASH_SIZE = 8
+
+
+@dataclass
+class CameraState:
+    camera_id: str
+    frame_hash: Optional[int] = None
+    analyzed_at: float = 0.0
+    last_result: Optional[dict] = None
+    # Status ("confirmed"/"pending") of the last analyzed frame
+    risk_level: Optional[str] = None
+    frames_received: int = 0
+    frames_analyzed: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def to_dict(self) -> dict:
+        return {
+            "camera_id": self.camera_id,
+            "frame_hash": f"{self.frame_hash:016x}" if self.frame_hash is not None else None,
+            "analyzed_at": self.analyzed_at or None,
+            "frames_received": self.frames_received,
+            "frames_analyzed": self.frames_analyzed,
+            "last_result": self.last_result
+        }
+
+
+_cameras = TTLCache(maxsize=SMOKE_CAMERA_MAX_CAMERAS, ttl=24 * 3600)
+
+
+def get_camera_state(camera_id: str) -> Optional[CameraState]:
+    return _cameras.get(camera_id)
+
+
+def _camera_state(camera_id: str) -> CameraState:
+    state = _cameras.get(camera_id)
+    if state is None:
+        state = CameraState(camera_id=camera_id)
+        _cameras.set(camera_id, state)
+    return state
+
+
+def difference_hash(file) -> int:
+    """64-bit dHash: grayscale 9x8 thumbnail, one bit per horizontal gradient sign."""
+    from PIL import Image
+
+    file.seek(0)
+    with Image.open(file) as img:
+        # JPEG draft mode decodes straight at a reduced scale
+        img.draft("L", (HASH_SIZE * 8, HASH_SIZE * 8))
+        pixels = img.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.BILINEAR).load()
+    value = 0
+    for y in range(HASH_SIZE):
+        for x in range(HASH_SIZE):
+            value = (value << 1) | (pixels[x, y] > pixels[x + 1, y])
+    file.seek(0)
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _risk_level(confidence: float) -> str:
+    # Same split as the smoke_detections row status
+    return "confirmed" if confidence > smoke_service.AUTO_REPORT_THRESHOLD else "pending"
+
+
+def _analysis_reason(distance: Optional[int]) -> str:
+    if distance is None:
+        return "first_frame"
+    if distance > SMOKE_CAMERA_PHASH_THRESHOLD:
+        return "scene_changed"
+    return "max_interval"
+
+
+async def ingest_camera_frame(
+    camera_id: str,
+    file: UploadFile,
+    db: Optional[Session] = None,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    district: Optional[str] = None
+) -> dict:
+    """
+    Watchtower camera frame:
+    - perceptual hash vs. last analyzed frame of this camera
+    - detector runs only if the scene changed (or the max interval passed)
+    - smoke_detections row (and auto fire_report) only on changes: a new or
+      changed scene, or a periodic re-analysis whose risk level changed
+    """
+    smoke_service.ensure_upload_size(file)
+    frame_hash = await asyncio.to_thread(difference_hash, file.file)
+    state = _camera_state(camera_id)
+
+    async with state.lock:
+        state.frames_received += 1
+        now = time.time()
+        distance = hamming_distance(frame_hash, state.frame_hash) if state.frame_hash is not None else None
+        interval_elapsed = now - state.analyzed_at >= SMOKE_CAMERA_MAX_INTERVAL_SECONDS
+        if distance is not None and distance <= SMOKE_CAMERA_PHASH_THRESHOLD and not interval_elapsed:
+            return {
+                "camera_id": camera_id,
+                "analyzed": False,
+                "hash_distance": distance,
+                "seconds_since_analysis": round(now - state.analyzed_at, 1),
+                "last_result": state.last_result
+            }
+
+        analysis = await smoke_service.analyze_upload(file)
+        reason = _analysis_reason(distance)
+        risk_level = _risk_level(analysis["max_confidence"])
+        # A static scene re-checked on the interval is only recorded if its risk level moved
+        record = reason != "max_interval" or risk_level != state.risk_level
+        saved = None
+        if db and record:
+            [saved] = await asyncio.to_thread(
+                smoke_service.save_detection_results,
+                db, [{"analysis": analysis, "filename": f"camera/{camera_id}/{file.filename or 'frame.jpg'}"}],
+                latitude, longitude, district
+            )
+        result = smoke_service.build_detection_response(analysis, saved)
+
+        state.frame_hash = frame_hash
+        state.analyzed_at = now
+        state.frames_analyzed += 1
+        state.risk_level = risk_level
+        state.last_result = {key: value for key, value in result.items() if key != "raw_result"}
+        return {
+            "camera_id": camera_id,
+            "analyzed": True,
+            "hash_distance": distance,
+            "reason": reason,
+            "recorded": bool(db) and record,
+            "result": result
+        }
@@ -0,0 +1,80 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from shapely.geometry import shape
+
+from app.services.polygon_grid import PolygonGrid, build_polygon_grid
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The frontend's district map is the source of the server-side registry
+DISTRICTS_GEOJSON_PATH = os.getenv(
+    "DISTRICTS_GEOJSON_PATH",
+    os.path.normpath(os.path.join(BACKEND_ROOT, "..", "wildfire-frontend", "app", "data", "tr_districts.json"))
+)
+
+_ASCII = str.maketrans("çğıöşüÇĞİÖŞÜ", "cgiosuCGIOSU")
+
+
+def district_id(city: Optional[str], name: str) -> str:
+    """"Istanbul", "Kadıköy" -> "istanbul-kadikoy" """
+    parts = [part for part in (city, name) if part]
+    return "-".join(part.translate(_ASCII).lower().strip().replace(" ", "-") for part in parts)
+
+
+@dataclass(eq=False)
+class District:
+    id: str
+    name: str
+    city: Optional[str]
+    region: Optional[str]
+    grid: PolygonGrid
+
+    def summary(self) -> dict:
+        return {"id": self.id, "name": self.name, "city": self.city, "region": self.region,
+                "bbox": list(self.grid.bounds), "cells": len(self.grid.cells)}
+
+
+class DistrictRegistry:
+    """
+    Static district polygons loaded once at startup, each with its prepared
+    geometry and precomputed nowcast grid, so /risk/nowcast_by_district does
+    no geometry work per request.
+    """
+
+    def __init__(self):
+        self._districts: Dict[str, District] = {}
+
+    def load(self, path: str = DISTRICTS_GEOJSON_PATH) -> int:
+        with open(path, encoding="utf-8") as file:
+            collection = json.load(file)
+        districts, skipped = {}, 0
+        for feature in collection.get("features", []):
+            properties = feature.get("properties") or {}
+            name = properties.get("district") or properties.get("name")
+            try:
+                geometry = shape(feature["geometry"])
+            except (ValueError, KeyError, TypeError, AttributeError, IndexError):
+                geometry = None
+            if not name or geometry is None or geometry.is_empty or geometry.geom_type not in ("Polygon", "MultiPolygon"):
+                skipped += 1
+                continue
+            key = str(properties.get("id") or district_id(properties.get("city"), name))
+            districts[key] = District(
+                id=key, name=name, city=properties.get("city"), region=properties.get("region"),
+                grid=build_polygon_grid(geometry)
+            )
+        if skipped:
+            print(f"District registry: skipped {skipped} features without a usable polygon in {path}")
+        self._districts = districts
+        return len(districts)
+
+    def get(self, key: str) -> Optional[District]:
+        return self._districts.get(key)
+
+    def all(self) -> List[District]:
+        return sorted(self._districts.values(), key=lambda district: district.id)
+
+
+district_registry = DistrictRegistry()
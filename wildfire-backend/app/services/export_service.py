@@ -0,0 +1,92 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+
+from app.db import SessionLocal
+from app.models.fire_incident import FireIncident
+from app.models.fire_report import FireReport
+from app.models.smoke_detection import SmokeDetection
+from app.utils.geo import BBox
+
+# Rows fetched per round-trip from the server-side cursor
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+
+EXPORT_ENTITIES = {
+    "smoke_detections": SmokeDetection,
+    "fire_incidents": FireIncident,
+    "fire_reports": FireReport,
+}
+# Tombstone marker and the fire_reports full-text index are not data
+EXPORT_EXCLUDED_COLUMNS = {"deleted_at", "search_vector"}
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def supports_bbox(entity: str) -> bool:
+    return hasattr(EXPORT_ENTITIES[entity], "latitude")
+
+
+def _export_query(entity: str, since: Optional[datetime], until: Optional[datetime], bbox: Optional[BBox]):
+    model = EXPORT_ENTITIES[entity]
+    # Plain column rows, not ORM objects: nothing accumulates in the identity map
+    columns = [column for column in model.__table__.columns if column.key not in EXPORT_EXCLUDED_COLUMNS]
+    query = select(*columns)
+    if hasattr(model, "deleted_at"):
+        query = query.where(model.deleted_at.is_(None))
+    if since is not None:
+        query = query.where(model.created_at >= since)
+    if until is not None:
+        query = query.where(model.created_at < until)
+    if bbox is not None:
+        min_lon, min_lat, max_lon, max_lat = bbox
+        query = query.where(
+            model.longitude.between(min_lon, max_lon),
+            model.latitude.between(min_lat, max_lat)
+        )
+    return query.order_by(model.created_at, model.id), [column.key for column in columns]
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def stream_export(
+    entity: str,
+    export_format: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    bbox: Optional[BBox] = None,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[str]:
+    """
+    Rows of `entity` as NDJSON lines or CSV, oldest first. Rows come from a
+    server-side cursor (yield_per) in batches, and each batch is encoded and
+    yielded before the next is fetched, so memory stays flat for any table
+    size. Opens its own session: it outlives the request's dependencies.
+    """
+    query, keys = _export_query(entity, since, until, bbox)
+    with SessionLocal() as db:
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(keys)
+            for partition in result.partitions():
+                writer.writerows([_format_value(value) for value in row] for row in partition)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            for partition in result.partitions():
+                yield "".join(
+                    json.dumps(dict(zip(keys, map(_format_value, row))), default=str, ensure_ascii=False) + "\n"
+                    for row in partition
+                )
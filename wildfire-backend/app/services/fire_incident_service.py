@@ -1,8 +1,11 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.orm import Session, joinedload
+from typing import Collection, List, Optional
 from uuid import UUID
+from datetime import datetime
 from app.models.fire_incident import FireIncident
 from app.schemas.fire_incident import FireIncidentCreate, FireIncidentUpdate
+from app.services.alert_service import incident_payload, publish_incident_payload, publish_incident
+from app.services.geofence_service import publish_geofence_matches
 
 def create_fire_incident(db: Session, data: FireIncidentCreate) -> FireIncident:
     """Yeni yangın olayı oluştur"""
@@ -18,15 +21,30 @@ def create_fire_incident(db: Session, data: FireIncidentCreate) -> FireIncident:
     db.add(incident)
     db.commit()
     db.refresh(incident)
+    payload = incident_payload(incident)
+    publish_incident_payload("incident.created", payload)
+    publish_geofence_matches("incident.created", payload)
     return incident
 
-def get_fire_incidents(db: Session, skip: int = 0, limit: int = 100) -> List[FireIncident]:
+# expand= name -> relationship. Both are many-to-one, so joinedload adds a
+# LEFT JOIN to the same query instead of one lazy load per incident.
+EXPAND_RELATIONSHIPS = {
+    "station": FireIncident.assigned_station,
+    "reporter": FireIncident.reported_by_user,
+}
+
+def _with_expand(query, expand: Collection[str]):
+    return query.options(*[joinedload(EXPAND_RELATIONSHIPS[name]) for name in expand])
+
+def get_fire_incidents(db: Session, skip: int = 0, limit: int = 100, expand: Collection[str] = ()) -> List[FireIncident]:
     """Tüm yangın olaylarını getir"""
-    return db.query(FireIncident).offset(skip).limit(limit).all()
+    query = db.query(FireIncident).filter(FireIncident.deleted_at.is_(None))
+    return _with_expand(query, expand).offset(skip).limit(limit).all()
 
-def get_fire_incident_by_id(db: Session, incident_id: UUID) -> Optional[FireIncident]:
+def get_fire_incident_by_id(db: Session, incident_id: UUID, expand: Collection[str] = ()) -> Optional[FireIncident]:
     """ID ile yangın olayı getir"""
-    return db.query(FireIncident).filter(FireIncident.id == incident_id).first()
+    query = db.query(FireIncident).filter(FireIncident.id == incident_id, FireIncident.deleted_at.is_(None))
+    return _with_expand(query, expand).first()
 
 def update_fire_incident(db: Session, incident_id: UUID, data: FireIncidentUpdate) -> Optional[FireIncident]:
     """Yangın olayını güncelle"""
@@ -40,14 +58,16 @@ def update_fire_incident(db: Session, incident_id: UUID, data: FireIncidentUpdat
     
     db.commit()
     db.refresh(incident)
+    publish_incident("incident.updated", incident)
     return incident
 
 def delete_fire_incident(db: Session, incident_id: UUID) -> bool:
-    """Yangın olayını sil"""
+    """Yangın olayını sil (soft delete: /sync için tombstone olarak kalır)"""
     incident = get_fire_incident_by_id(db, incident_id)
     if not incident:
         return False
     
-    db.delete(incident)
+    incident.deleted_at = datetime.utcnow()
     db.commit()
+    publish_incident("incident.deleted", incident)
     return True
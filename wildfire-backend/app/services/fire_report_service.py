@@ -1,9 +1,22 @@
+from sqlalchemy import REAL, DateTime, cast, func, literal, literal_column, tuple_
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
+from datetime import datetime
+import base64
+import json
+import os
 from app.models.fire_report import FireReport
 from app.schemas.fire_report import FireReportCreate, FireReportUpdate
 
+FIRE_REPORT_SEARCH_LIMIT = int(os.getenv("FIRE_REPORT_SEARCH_LIMIT", "20"))
+FIRE_REPORT_SEARCH_MAX_LIMIT = int(os.getenv("FIRE_REPORT_SEARCH_MAX_LIMIT", "100"))
+# Arama sorgusu iki config ile çözülür (bkz. migration a4c7e2f95d36): köklü Türkçe ve ham kelimeler
+SEARCH_CONFIGS = ("turkish", "simple")
+SEARCH_SORTS = ("rank", "recent")
+# sort=recent: created_at'i boş raporların sıralama değeri
+SEARCH_NULL_CREATED_AT = datetime(1970, 1, 1)
+
 def create_fire_report(db: Session, data: FireReportCreate) -> FireReport:
     """Yeni yangın raporu oluştur"""
     report = FireReport(
@@ -20,11 +33,11 @@ def create_fire_report(db: Session, data: FireReportCreate) -> FireReport:
 
 def get_fire_reports(db: Session, skip: int = 0, limit: int = 100) -> List[FireReport]:
     """Tüm yangın raporlarını getir"""
-    return db.query(FireReport).offset(skip).limit(limit).all()
+    return db.query(FireReport).filter(FireReport.deleted_at.is_(None)).offset(skip).limit(limit).all()
 
 def get_fire_report_by_id(db: Session, report_id: int) -> Optional[FireReport]:
     """ID ile yangın raporu getir"""
-    return db.query(FireReport).filter(FireReport.id == report_id).first()
+    return db.query(FireReport).filter(FireReport.id == report_id, FireReport.deleted_at.is_(None)).first()
 
 def update_fire_report(db: Session, report_id: int, data: FireReportUpdate) -> Optional[FireReport]:
     """Yangın raporunu güncelle"""
@@ -41,11 +54,69 @@ def update_fire_report(db: Session, report_id: int, data: FireReportUpdate) -> O
     return report
 
 def delete_fire_report(db: Session, report_id: int) -> bool:
-    """Yangın raporunu sil"""
+    """Yangın raporunu sil (soft delete: /sync için tombstone olarak kalır)"""
     report = get_fire_report_by_id(db, report_id)
     if not report:
         return False
     
-    db.delete(report)
+    report.deleted_at = datetime.utcnow()
     db.commit()
     return True
+
+def encode_search_cursor(sort: str, value, report_id: int) -> str:
+    raw = json.dumps([sort, value.isoformat() if isinstance(value, datetime) else value, report_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_search_cursor(cursor: str, sort: str) -> Tuple[object, int]:
+    """(sıralama değeri, rapor id); bizim vermediğimiz bir cursor için ValueError"""
+    try:
+        cursor_sort, value, report_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if cursor_sort != sort or not isinstance(report_id, int):
+            raise ValueError("cursor does not match this query")
+        if sort == "recent":
+            value = datetime.fromisoformat(value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = float(value)
+        else:
+            raise ValueError("rank must be a number")
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid search cursor: {e}")
+    return value, report_id
+
+def _search_match(q: str):
+    """(eşleşme filtresi, sıralama ifadesi) - GIN indeksli search_vector; iki config'in sorgusu OR ile birleşir"""
+    query = None
+    for config in SEARCH_CONFIGS:
+        part = func.websearch_to_tsquery(literal_column(f"'{config}'::regconfig"), q)
+        query = part if query is None else query.op("||")(part)
+    return FireReport.search_vector.op("@@")(query), func.ts_rank_cd(FireReport.search_vector, query)
+
+def search_fire_reports(
+    db: Session,
+    q: str,
+    limit: int = FIRE_REPORT_SEARCH_LIMIT,
+    cursor: Optional[str] = None,
+    sort: str = "rank"
+) -> dict:
+    """
+    Başlık/açıklama/konumda tam metin arama. Sonuçlar alaka (rank) ya da
+    yenilik (recent) sırasında; sayfalama offset değil keyset ile yapılır,
+    sonraki sayfa `next_cursor` ile istenir.
+    """
+    match, rank = _search_match(q)
+    # created_at boş olabilir (eski kayıtlar): en eskiymiş gibi en sona sıralanır
+    key = rank if sort == "rank" else func.coalesce(FireReport.created_at, literal(SEARCH_NULL_CREATED_AT, DateTime))
+    query = db.query(FireReport, rank.label("rank"), key.label("sort_key")).filter(match, FireReport.deleted_at.is_(None))
+    if cursor:
+        value, report_id = decode_search_cursor(cursor, sort)
+        # rank real (float4) döner: karşılaştırma da real üzerinden, yoksa eşit rank'lı satırlar atlanır
+        bound = cast(literal(value), REAL) if sort == "rank" else literal(value)
+        query = query.filter(tuple_(key, FireReport.id) < tuple_(bound, literal(report_id)))
+    rows = query.order_by(key.desc(), FireReport.id.desc()).limit(limit + 1).all()
+
+    items = [{"report": report, "rank": float(row_rank)} for report, row_rank, _ in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_search_cursor(sort, last.sort_key, last[0].id)
+    return {"items": items, "next_cursor": next_cursor}
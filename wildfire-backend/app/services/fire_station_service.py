@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
+from datetime import datetime
 from app.models.fire_station import FireStation
 from app.schemas.fire_station import FireStationCreate, FireStationUpdate
 
@@ -20,11 +21,11 @@ def create_fire_station(db: Session, data: FireStationCreate) -> FireStation:
 
 def get_fire_stations(db: Session, skip: int = 0, limit: int = 100) -> List[FireStation]:
     """Tüm itfaiye istasyonlarını getir"""
-    return db.query(FireStation).offset(skip).limit(limit).all()
+    return db.query(FireStation).filter(FireStation.deleted_at.is_(None)).offset(skip).limit(limit).all()
 
 def get_fire_station_by_id(db: Session, station_id: UUID) -> Optional[FireStation]:
     """ID ile itfaiye istasyonu getir"""
-    return db.query(FireStation).filter(FireStation.id == station_id).first()
+    return db.query(FireStation).filter(FireStation.id == station_id, FireStation.deleted_at.is_(None)).first()
 
 def update_fire_station(db: Session, station_id: UUID, data: FireStationUpdate) -> Optional[FireStation]:
     """İtfaiye istasyonunu güncelle"""
@@ -41,11 +42,11 @@ def update_fire_station(db: Session, station_id: UUID, data: FireStationUpdate)
     return station
 
 def delete_fire_station(db: Session, station_id: UUID) -> bool:
-    """İtfaiye istasyonunu sil"""
+    """İtfaiye istasyonunu sil (soft delete: /sync için tombstone olarak kalır)"""
     station = get_fire_station_by_id(db, station_id)
     if not station:
         return False
     
-    db.delete(station)
+    station.deleted_at = datetime.utcnow()
     db.commit()
     return True
@@ -0,0 +1,226 @@
+import math
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from fastapi import HTTPException
+from shapely import STRtree, get_num_coordinates
+from shapely.affinity import scale
+from shapely.geometry import Point, shape
+from shapely.geometry.base import BaseGeometry
+from shapely.prepared import prep
+from sqlalchemy.orm import Session
+
+from app.models.geofence_subscription import GeofenceSubscription
+from app.schemas.geofence import GeofenceSubscriptionCreate
+from app.services.alert_service import alert_broker
+from app.services.smoke_cluster_service import KM_PER_DEGREE, haversine_km
+
+GEOFENCE_MAX_PER_USER = int(os.getenv("GEOFENCE_MAX_PER_USER", "20"))
+GEOFENCE_MAX_RADIUS_M = int(os.getenv("GEOFENCE_MAX_RADIUS_M", "100000"))
+GEOFENCE_MAX_VERTICES = int(os.getenv("GEOFENCE_MAX_VERTICES", "5000"))
+# Subscriptions added since the last STRtree build are scanned linearly; past
+# this many (or this many removals) the tree is rebuilt.
+GEOFENCE_REBUILD_THRESHOLD = int(os.getenv("GEOFENCE_REBUILD_THRESHOLD", "64"))
+
+
+@dataclass(eq=False)
+class GeofenceEntry:
+    id: uuid.UUID
+    user_id: str
+    geometry: BaseGeometry
+    # Circles: the tree holds a bounding ellipse; the exact test is haversine
+    center: Optional[tuple] = None
+    radius_km: Optional[float] = None
+
+    def __post_init__(self):
+        self._prepared = prep(self.geometry) if self.center is None else None
+
+    def contains(self, lat: float, lon: float) -> bool:
+        if self.center is not None:
+            return haversine_km(lat, lon, *self.center) <= self.radius_km
+        return self._prepared.intersects(Point(lon, lat))
+
+
+def circle_geometry(lat: float, lon: float, radius_m: float) -> BaseGeometry:
+    """Ellipse in lon/lat degrees covering a radius_m circle (longitude degrees shrink with latitude)."""
+    lat_deg = radius_m / 1000 / KM_PER_DEGREE
+    lon_deg = lat_deg / max(math.cos(math.radians(lat)), 0.01)
+    # Slightly oversized: it only selects candidates for the exact distance test
+    return scale(Point(lon, lat).buffer(1.01, quad_segs=16), xfact=lon_deg, yfact=lat_deg)
+
+
+def entry_from_row(row: GeofenceSubscription) -> GeofenceEntry:
+    if row.geometry:
+        return GeofenceEntry(id=row.id, user_id=str(row.user_id), geometry=shape(row.geometry))
+    lat, lon = float(row.latitude), float(row.longitude)
+    return GeofenceEntry(
+        id=row.id, user_id=str(row.user_id), geometry=circle_geometry(lat, lon, row.radius_m),
+        center=(lat, lon), radius_km=row.radius_m / 1000
+    )
+
+
+class GeofenceIndex:
+    """
+    All subscription areas in a Shapely STRtree, so matching a point costs a
+    tree query (O(log n)) plus exact tests on the few candidates, not a loop
+    over every user's area. STRtree is immutable: additions go to a small
+    pending list scanned linearly and removals are masked until the pending
+    or removed count reaches GEOFENCE_REBUILD_THRESHOLD, then the tree is
+    rebuilt. The DB is the source of truth; the index is warmed at startup.
+    Single process only, like the alert broker.
+    """
+
+    def __init__(self, rebuild_threshold: int = GEOFENCE_REBUILD_THRESHOLD):
+        self.rebuild_threshold = rebuild_threshold
+        self._entries: Dict[uuid.UUID, GeofenceEntry] = {}
+        self._tree: Optional[STRtree] = None
+        self._tree_entries: List[GeofenceEntry] = []
+        self._pending: Dict[uuid.UUID, GeofenceEntry] = {}
+        self._removed: Set[uuid.UUID] = set()
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        return {"subscriptions": len(self._entries), "indexed": len(self._tree_entries),
+                "pending": len(self._pending), "removed": len(self._removed)}
+
+    def _rebuild(self) -> None:
+        self._tree_entries = list(self._entries.values())
+        self._tree = STRtree([entry.geometry for entry in self._tree_entries]) if self._tree_entries else None
+        self._pending.clear()
+        self._removed.clear()
+
+    def _maybe_rebuild(self) -> None:
+        if len(self._pending) >= self.rebuild_threshold or len(self._removed) >= self.rebuild_threshold:
+            self._rebuild()
+
+    def add(self, entry: GeofenceEntry) -> None:
+        with self._lock:
+            if entry.id in self._entries:
+                self._discard(entry.id)
+            self._entries[entry.id] = entry
+            self._pending[entry.id] = entry
+            self._maybe_rebuild()
+
+    def _discard(self, subscription_id: uuid.UUID) -> None:
+        self._entries.pop(subscription_id, None)
+        if self._pending.pop(subscription_id, None) is None:
+            self._removed.add(subscription_id)
+
+    def remove(self, subscription_id: uuid.UUID) -> None:
+        with self._lock:
+            if subscription_id in self._entries:
+                self._discard(subscription_id)
+                self._maybe_rebuild()
+
+    def remove_user(self, user_id) -> None:
+        with self._lock:
+            for entry in [entry for entry in self._entries.values() if entry.user_id == str(user_id)]:
+                self._discard(entry.id)
+            self._maybe_rebuild()
+
+    def match(self, lat: float, lon: float) -> List[GeofenceEntry]:
+        """Subscriptions whose area contains the point."""
+        point = Point(lon, lat)
+        with self._lock:
+            candidates = list(self._pending.values())
+            if self._tree is not None:
+                candidates.extend(
+                    entry for entry in (self._tree_entries[i] for i in self._tree.query(point))
+                    if entry.id not in self._removed
+                )
+        return [entry for entry in candidates if entry.contains(lat, lon)]
+
+    def load(self, db: Session) -> int:
+        rows = db.query(GeofenceSubscription).all()
+        with self._lock:
+            self._entries = {row.id: entry_from_row(row) for row in rows}
+            self._rebuild()
+        return len(rows)
+
+
+geofence_index = GeofenceIndex()
+
+
+def publish_geofence_matches(alert_type: str, payload: dict) -> int:
+    """
+    Send an alert to every user with a subscription containing the payload's
+    point (their authenticated /alerts streams). Returns the number of users.
+    """
+    if payload.get("latitude") is None or payload.get("longitude") is None:
+        return 0
+    recipients = frozenset(entry.user_id for entry in geofence_index.match(payload["latitude"], payload["longitude"]))
+    if recipients:
+        alert_broker.publish(
+            f"geofence.{alert_type}", payload, payload.get("district"),
+            payload["latitude"], payload["longitude"], recipients=recipients
+        )
+    return len(recipients)
+
+
+def _validated_geometry(data: GeofenceSubscriptionCreate) -> Optional[dict]:
+    """GeoJSON Polygon/MultiPolygon -> geometry dict, 400 if unusable"""
+    if data.geometry is None:
+        if not 0 < data.radius_m <= GEOFENCE_MAX_RADIUS_M:
+            raise HTTPException(status_code=400, detail=f"radius_m must be between 1 and {GEOFENCE_MAX_RADIUS_M}")
+        if not (-90 <= data.latitude <= 90 and -180 <= data.longitude <= 180):
+            raise HTTPException(status_code=400, detail="latitude/longitude out of range")
+        return None
+    try:
+        geometry = shape(data.geometry)
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid GeoJSON geometry: {e}")
+    if geometry.geom_type not in ("Polygon", "MultiPolygon"):
+        raise HTTPException(status_code=400, detail="geometry must be a Polygon or MultiPolygon")
+    if geometry.is_empty or not geometry.is_valid:
+        raise HTTPException(status_code=400, detail="geometry is empty or self-intersecting")
+    if get_num_coordinates(geometry) > GEOFENCE_MAX_VERTICES:
+        raise HTTPException(status_code=400, detail=f"geometry has more than {GEOFENCE_MAX_VERTICES} vertices")
+    return data.geometry
+
+
+def create_subscription(db: Session, user_id: uuid.UUID, data: GeofenceSubscriptionCreate) -> GeofenceSubscription:
+    """Yeni bölge aboneliği oluştur ve indekse ekle"""
+    geometry = _validated_geometry(data)
+    count = db.query(GeofenceSubscription).filter(GeofenceSubscription.user_id == user_id).count()
+    if count >= GEOFENCE_MAX_PER_USER:
+        raise HTTPException(status_code=400, detail=f"At most {GEOFENCE_MAX_PER_USER} subscriptions per user")
+    subscription = GeofenceSubscription(
+        user_id=user_id,
+        name=data.name,
+        geometry=geometry,
+        latitude=data.latitude if geometry is None else None,
+        longitude=data.longitude if geometry is None else None,
+        radius_m=data.radius_m if geometry is None else None
+    )
+    db.add(subscription)
+    db.commit()
+    db.refresh(subscription)
+    geofence_index.add(entry_from_row(subscription))
+    return subscription
+
+
+def get_subscriptions(db: Session, user_id: uuid.UUID) -> List[GeofenceSubscription]:
+    """Kullanıcının bölge abonelikleri"""
+    return (
+        db.query(GeofenceSubscription)
+        .filter(GeofenceSubscription.user_id == user_id)
+        .order_by(GeofenceSubscription.created_at)
+        .all()
+    )
+
+
+def delete_subscription(db: Session, user_id: uuid.UUID, subscription_id: uuid.UUID) -> bool:
+    """Kullanıcının bölge aboneliğini sil"""
+    subscription = db.query(GeofenceSubscription).filter(
+        GeofenceSubscription.id == subscription_id,
+        GeofenceSubscription.user_id == user_id
+    ).first()
+    if not subscription:
+        return False
+    db.delete(subscription)
+    db.commit()
+    geofence_index.remove(subscription_id)
+    return True
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import re
+import uuid
+from typing import BinaryIO, Optional
+
+# Uploaded evidence images, stored once per SHA-256 under IMAGE_STORE_DIR:
+#   <dir>/<aa>/<digest>.<ext>            original
+#   <dir>/thumbs/<size>/<aa>/<digest>.jpg  lazily generated thumbnails
+IMAGE_STORE_ENABLED = os.getenv("IMAGE_STORE_ENABLED", "true").lower() == "true"
+IMAGE_STORE_DIR = os.getenv("IMAGE_STORE_DIR", "data/images")
+IMAGE_URL_PREFIX = "/images"
+THUMBNAIL_SIZES = (128, 256, 512)
+THUMBNAIL_JPEG_QUALITY = 80
+
+_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/jpg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+}
+_MEDIA_TYPES = {"jpg": "image/jpeg", "png": "image/png", "webp": "image/webp", "bin": "application/octet-stream"}
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def is_valid_digest(digest: str) -> bool:
+    return bool(_DIGEST_RE.match(digest))
+
+
+def image_url(digest: str) -> str:
+    return f"{IMAGE_URL_PREFIX}/{digest}"
+
+
+def _original_path(digest: str, ext: str) -> str:
+    return os.path.join(IMAGE_STORE_DIR, digest[:2], f"{digest}.{ext}")
+
+
+def _thumbnail_path(digest: str, size: int) -> str:
+    return os.path.join(IMAGE_STORE_DIR, "thumbs", str(size), digest[:2], f"{digest}.jpg")
+
+
+def find_image(digest: str) -> Optional[tuple]:
+    """(path, media_type) of a stored original, or None"""
+    for ext, media_type in _MEDIA_TYPES.items():
+        path = _original_path(digest, ext)
+        if os.path.exists(path):
+            return path, media_type
+    return None
+
+
+def _write_atomic(path: str, write):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as out:
+            write(out)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class StagedImage:
+    """
+    Copy of an upload written while it is being hashed, so the upload is read
+    once for both. commit() moves it into place under its digest (or drops it
+    if that image is already stored); discard() removes whatever is left.
+    """
+
+    def __init__(self):
+        os.makedirs(IMAGE_STORE_DIR, exist_ok=True)
+        self.path = os.path.join(IMAGE_STORE_DIR, f".staging-{uuid.uuid4().hex}.tmp")
+        self._out: BinaryIO = open(self.path, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._out.write(chunk)
+
+    def commit(self, digest: str, content_type: Optional[str] = None) -> str:
+        self._out.close()
+        if find_image(digest) is None:
+            path = _original_path(digest, _EXTENSIONS.get((content_type or "").lower(), "bin"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(self.path, path)
+        return image_url(digest)
+
+    def discard(self) -> None:
+        self._out.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def stage_image() -> Optional[StagedImage]:
+    """A StagedImage, or None when the store is disabled or not writable."""
+    if not IMAGE_STORE_ENABLED:
+        return None
+    try:
+        return StagedImage()
+    except OSError as e:
+        print(f"Image store write failed: {e}")
+        return None
+
+
+def _make_thumbnail(source: str, target: str, size: int):
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as img:
+        img.draft("RGB", (size, size))
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        img.thumbnail((size, size), Image.LANCZOS)
+        _write_atomic(target, lambda out: img.save(out, format="JPEG", quality=THUMBNAIL_JPEG_QUALITY))
+
+
+async def get_thumbnail(digest: str, size: int) -> Optional[str]:
+    """Path of the cached thumbnail, generating it on first request."""
+    target = _thumbnail_path(digest, size)
+    if os.path.exists(target):
+        return target
+    original = find_image(digest)
+    if original is None:
+        return None
+    from PIL import Image
+    try:
+        await asyncio.to_thread(_make_thumbnail, original[0], target, size)
+    except (OSError, Image.DecompressionBombError) as e:
+        # Uploads are stored as sent; a non-image (UnidentifiedImageError is an
+        # OSError), a truncated file or a decompression bomb simply has no thumbnail
+        print(f"Thumbnail failed ({digest}): {e}")
+        return None
+    return target
@@ -0,0 +1,275 @@
+import codecs
+import csv
+import io
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.fire_incident import FireIncident
+from app.models.fire_station import FireStation
+from app.models.user import User
+from app.schemas.fire_incident import FireIncidentCreate
+from app.schemas.fire_station import FireStationCreate
+
+# Rows validated and written per round-trip
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+# Row errors listed in the report (the count is always exact)
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+READ_CHUNK_BYTES = 64 * 1024
+
+IMPORT_ENTITIES = {
+    "stations": (FireStation, FireStationCreate),
+    "incidents": (FireIncident, FireIncidentCreate),
+}
+
+
+class ImportFormatError(ValueError):
+    """The file itself is unreadable (not a single bad row)."""
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".geojson", ".json")) or content_type in ("application/geo+json", "application/json"):
+        return "geojson"
+    raise ImportFormatError("Unknown file format (use .csv or .geojson)")
+
+
+def iter_csv_rows(file: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    """(line number, row) pairs; empty cells become missing fields."""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, {key.strip(): value.strip() for key, value in row.items()
+                                    if key and value is not None and value.strip() != ""}
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFormatError(f"Invalid CSV: {e}")
+    finally:
+        text.detach()
+
+
+def iter_geojson_features(file: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    """
+    Features of a FeatureCollection decoded one at a time from 64 KB reads,
+    so a large file is never held in memory. Yields (feature index, feature).
+    """
+    decoder = json.JSONDecoder()
+    # Incremental: a multi-byte character may straddle two reads
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer, eof = "", False
+
+    def fill() -> bool:
+        nonlocal buffer, eof
+        chunk = file.read(READ_CHUNK_BYTES)
+        if not chunk:
+            eof = True
+            buffer += text_decoder.decode(b"", final=True)
+            return False
+        try:
+            buffer += text_decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            raise ImportFormatError(f"GeoJSON is not UTF-8: {e}")
+        return True
+
+    # Seek to the opening bracket of the "features" array
+    while True:
+        key = buffer.find('"features"')
+        start = buffer.find("[", key) if key >= 0 else -1
+        if start >= 0:
+            buffer = buffer[start + 1:]
+            break
+        if not fill():
+            raise ImportFormatError("GeoJSON must be a FeatureCollection with a 'features' array")
+
+    index = 0
+    while True:
+        stripped = buffer.lstrip(" \t\r\n,")
+        if not stripped:
+            buffer = ""
+            if not fill():
+                raise ImportFormatError("Unexpected end of GeoJSON")
+            continue
+        buffer = stripped
+        if buffer[0] == "]":
+            return
+        try:
+            feature, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            if not eof and fill():
+                continue
+            raise ImportFormatError(f"Invalid GeoJSON near feature {index}: {e.msg}")
+        buffer = buffer[end:]
+        yield index, feature
+        index += 1
+
+
+def feature_to_row(feature: dict) -> dict:
+    """Point geometry + properties -> flat row"""
+    if not isinstance(feature, dict) or feature.get("type") != "Feature":
+        raise ValueError("not a GeoJSON Feature")
+    row = dict(feature.get("properties") or {})
+    geometry = feature.get("geometry")
+    if geometry:
+        if geometry.get("type") != "Point":
+            raise ValueError(f"geometry must be a Point, got {geometry.get('type')}")
+        longitude, latitude = geometry["coordinates"][:2]
+        row["longitude"], row["latitude"] = longitude, latitude
+    return row
+
+
+def iter_rows(file: BinaryIO, file_format: str) -> Iterator[Tuple[int, object]]:
+    """(row number, flat dict or exception) for each record of the file"""
+    if file_format == "csv":
+        yield from iter_csv_rows(file)
+        return
+    for index, feature in iter_geojson_features(file):
+        try:
+            yield index, feature_to_row(feature)
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            yield index, e
+
+
+def _validate(schema, row) -> Tuple[Optional[dict], List[str]]:
+    if isinstance(row, Exception):
+        return None, [str(row)]
+    try:
+        values = schema(**row).model_dump()
+    except ValidationError as e:
+        return None, [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()]
+    errors = []
+    if values.get("latitude") is not None and not -90 <= values["latitude"] <= 90:
+        errors.append("latitude: must be between -90 and 90")
+    if values.get("longitude") is not None and not -180 <= values["longitude"] <= 180:
+        errors.append("longitude: must be between -180 and 180")
+    return (None, errors) if errors else (values, [])
+
+
+def _missing_references(db: Session, model, chunk: List[Tuple[int, dict]]) -> dict:
+    """Row number -> errors for incident foreign keys that do not exist (one query per key)."""
+    if model is not FireIncident:
+        return {}
+    errors = {}
+    for column, target in (("assigned_station_id", FireStation), ("reported_by", User)):
+        ids = {values[column] for _, values in chunk if values.get(column)}
+        if not ids:
+            continue
+        query = db.query(target.id).filter(target.id.in_(ids))
+        if target is FireStation:
+            query = query.filter(FireStation.deleted_at.is_(None))
+        found = {row_id for (row_id,) in query}
+        for row_number, values in chunk:
+            if values.get(column) and values[column] not in found:
+                errors.setdefault(row_number, []).append(f"{column}: {values[column]} not found")
+    return errors
+
+
+def _copy_rows(db: Session, model, rows: List[dict]) -> None:
+    """PostgreSQL COPY FROM STDIN (CSV) on the session's connection"""
+    columns = list(rows[0].keys())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["\\N" if row[column] is None else row[column] for column in columns])
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def _insert_rows(db: Session, model, rows: List[dict], method: str) -> None:
+    if method == "copy":
+        _copy_rows(db, model, rows)
+    else:
+        # executemany; SQLAlchemy batches these into multi-row VALUES
+        db.execute(insert(model), rows)
+
+
+def default_method(db: Session) -> str:
+    return "copy" if db.get_bind().dialect.name == "postgresql" else "insert"
+
+
+def import_rows(
+    db: Session,
+    entity: str,
+    file: BinaryIO,
+    file_format: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    method: Optional[str] = None,
+    dry_run: bool = False
+) -> dict:
+    """
+    Stream-validate a GeoJSON/CSV file and load the valid rows chunk by chunk
+    with set-based inserts (or COPY on PostgreSQL), in one transaction.
+    Invalid rows are skipped and listed in the report with their row number
+    (CSV line / feature index). dry_run validates everything and rolls back.
+
+    Imports are silent on purpose: imported incidents are backfills, so no
+    incident.created alerts or geofence matches are published for them (a
+    national file would flood every stream with stale events). Clients still
+    receive the rows through /sync.
+    """
+    model, schema = IMPORT_ENTITIES[entity]
+    method = method or default_method(db)
+    started = time.perf_counter()
+    report = {"entity": entity, "format": file_format, "method": method, "dry_run": dry_run,
+              "processed": 0, "imported": 0, "failed": 0, "errors": [], "errors_truncated": False}
+
+    def fail(row_number: int, errors: List[str]):
+        report["failed"] += 1
+        if len(report["errors"]) < IMPORT_MAX_ERRORS:
+            report["errors"].append({"row": row_number, "errors": errors})
+        else:
+            report["errors_truncated"] = True
+
+    def flush(chunk: List[Tuple[int, dict]]):
+        reference_errors = _missing_references(db, model, chunk)
+        now = datetime.utcnow()
+        rows = []
+        for row_number, values in chunk:
+            if row_number in reference_errors:
+                fail(row_number, reference_errors[row_number])
+                continue
+            rows.append({"id": uuid.uuid4(), **values, "created_at": now, "updated_at": now})
+        if rows:
+            _insert_rows(db, model, rows, method)
+            report["imported"] += len(rows)
+
+    try:
+        chunk: List[Tuple[int, dict]] = []
+        for row_number, row in iter_rows(file, file_format):
+            report["processed"] += 1
+            values, errors = _validate(schema, row)
+            if errors:
+                fail(row_number, errors)
+                continue
+            chunk.append((row_number, values))
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    report["errors"].sort(key=lambda error: error["row"])
+    report["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return report
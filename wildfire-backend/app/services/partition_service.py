@@ -0,0 +1,184 @@
+import asyncio
+import gzip
+import os
+import re
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.smoke_detection import SmokeDetection
+
+# Monthly partitions kept ready past the current month
+SMOKE_PARTITION_MONTHS_AHEAD = int(os.getenv("SMOKE_PARTITION_MONTHS_AHEAD", "3"))
+# Months of detections kept in the database; older partitions are archived
+# to SMOKE_ARCHIVE_DIR and dropped. 0 disables archival.
+SMOKE_RETENTION_MONTHS = int(os.getenv("SMOKE_RETENTION_MONTHS", "12"))
+SMOKE_ARCHIVE_DIR = os.getenv("SMOKE_ARCHIVE_DIR", "archive/smoke_detections")
+SMOKE_PARTITION_INTERVAL_SECONDS = float(os.getenv("SMOKE_PARTITION_INTERVAL_SECONDS", "21600"))
+
+PARENT = SmokeDetection.__tablename__
+DEFAULT_PARTITION = f"{PARENT}_default"
+PARTITION_NAME = re.compile(rf"^{PARENT}_y(\d{{4}})m(\d{{2}})$")
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month:%Y}m{month:%m}"
+
+
+def is_partitioned(db: Session) -> bool:
+    """True once the partitioning migration ran (PostgreSQL only)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :name"
+    ), {"name": PARENT}).scalar())
+
+
+def list_partitions(db: Session) -> List[date]:
+    """Months that have a partition, oldest first (the default partition is not listed)"""
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :name"
+    ), {"name": PARENT}).scalars()
+    months = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def _try_lock(db: Session) -> bool:
+    return bool(db.execute(text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"), {"key": PARENT}).scalar())
+
+
+def create_partition(db: Session, month: date) -> None:
+    """
+    Attach the partition for `month`. Rows that already landed in the default
+    partition for that month are moved into it first, otherwise ATTACH fails.
+    """
+    name, start, end = partition_name(month), month, add_months(month, 1)
+    bounds = {"start": start, "end": end}
+    db.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS)"))
+    db.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), bounds)
+    # Indexes, primary key and the cluster FK are cloned from the parent on attach
+    db.execute(text(f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"))
+
+
+def ensure_partitions(db: Session, months_ahead: int = SMOKE_PARTITION_MONTHS_AHEAD) -> List[str]:
+    """Create missing partitions from the current month to `months_ahead` months later."""
+    created = []
+    this_month = datetime.utcnow().date().replace(day=1)
+    try:
+        if not _try_lock(db):
+            return created
+        existing = set(list_partitions(db))
+        for offset in range(months_ahead + 1):
+            month = add_months(this_month, offset)
+            if month not in existing:
+                create_partition(db, month)
+                created.append(partition_name(month))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return created
+
+
+def _copy_to_archive(db: Session, name: str, path: str) -> None:
+    """COPY the partition to a gzip'd CSV; written to a temp file and renamed when complete"""
+    partial = f"{path}.partial"
+    cursor = db.connection().connection.cursor()
+    try:
+        with gzip.open(partial, "wb") as out:
+            cursor.copy_expert(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)", out)
+    finally:
+        cursor.close()
+    os.replace(partial, path)
+
+
+def archive_partitions(db: Session, retention_months: int = SMOKE_RETENTION_MONTHS,
+                       archive_dir: str = SMOKE_ARCHIVE_DIR) -> List[str]:
+    """
+    Archive partitions older than `retention_months` to
+    `<archive_dir>/<partition>.csv.gz`, then detach and drop them. One
+    transaction per partition: a failure leaves that partition in place.
+    Returns the written archive paths.
+    """
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(datetime.utcnow().date().replace(day=1), -retention_months)
+    os.makedirs(archive_dir, exist_ok=True)
+    archived = []
+    for month in list_partitions(db):
+        if month >= cutoff:
+            break
+        name = partition_name(month)
+        path = os.path.join(archive_dir, f"{name}.csv.gz")
+        try:
+            if not _try_lock(db):
+                break
+            _copy_to_archive(db, name, path)
+            db.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+            db.execute(text(f"DROP TABLE {name}"))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        archived.append(path)
+    return archived
+
+
+def maintain_partitions(db: Session) -> dict:
+    """Roll the partition window forward and archive expired months."""
+    if not is_partitioned(db):
+        return {"created": [], "archived": []}
+    return {"created": ensure_partitions(db), "archived": archive_partitions(db)}
+
+
+class PartitionMaintainer:
+    """Runs maintain_partitions every SMOKE_PARTITION_INTERVAL_SECONDS in a worker thread."""
+
+    def __init__(self, interval: float = SMOKE_PARTITION_INTERVAL_SECONDS):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                result = await asyncio.to_thread(self.run_now)
+                if result["created"] or result["archived"]:
+                    print(f"Smoke detection partitions: created {result['created']}, archived {result['archived']}")
+            except Exception as e:
+                print(f"Smoke detection partition maintenance failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    @staticmethod
+    def run_now() -> dict:
+        with SessionLocal() as db:
+            return maintain_partitions(db)
+
+
+partition_maintainer = PartitionMaintainer()
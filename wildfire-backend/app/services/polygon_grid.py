@@ -0,0 +1,132 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import shape
+from shapely.geometry.base import BaseGeometry
+
+from app.services.weather_service import OpenWeatherService
+from app.utils.cache import TTLCache
+
+# Nowcast grid resolution over the polygon's bounding box
+GRID_NX, GRID_NY = 20, 20
+# Ad-hoc polygons above this many vertices are simplified (topology-preserving)
+POLYGON_MAX_VERTICES = int(os.getenv("POLYGON_MAX_VERTICES", "1000"))
+POLYGON_CACHE_SIZE = int(os.getenv("POLYGON_CACHE_SIZE", "256"))
+POLYGON_CACHE_TTL_SECONDS = float(os.getenv("POLYGON_CACHE_TTL_SECONDS", "3600"))
+# Coordinates are rounded to this many decimals (~1 cm) before hashing
+GEOMETRY_HASH_DECIMALS = 7
+
+# Only the lat/lon-dependent layers of extract_weather_features are used here
+_static_layers = OpenWeatherService()
+
+
+@dataclass(frozen=True)
+class PolygonGrid:
+    """
+    Everything the nowcast needs from a polygon that does not depend on the
+    weather: bounds, centroid, the grid cells inside the polygon (in the
+    order the nowcast emits them) and each cell's static layers (vegetation,
+    human activity, default fuel moisture). `geometry` is the prepared
+    (possibly simplified) polygon the grid was built from.
+    """
+    geometry: BaseGeometry
+    bounds: Tuple[float, float, float, float]
+    center: Tuple[float, float]
+    cells: Tuple[Tuple[float, float], ...]
+    base_features: Tuple[dict, ...]
+
+    @property
+    def strategic_points(self) -> List[Tuple[float, float]]:
+        """(lon, lat) forecast sample points: bbox corners and centroid"""
+        min_lon, min_lat, max_lon, max_lat = self.bounds
+        return [(min_lon, min_lat), (max_lon, min_lat), (min_lon, max_lat), (max_lon, max_lat), self.center]
+
+
+def build_polygon_grid(polygon: BaseGeometry, nx: int = GRID_NX, ny: int = GRID_NY) -> PolygonGrid:
+    """Bounds, centroid and the inside-mask of an nx x ny grid, tested in one vectorized call."""
+    shapely.prepare(polygon)
+    min_lon, min_lat, max_lon, max_lat = polygon.bounds
+    lon_points = np.linspace(min_lon, max_lon, nx)
+    lat_points = np.linspace(min_lat, max_lat, ny)
+    # Longitude-major, like the original nested loop
+    lons, lats = np.meshgrid(lon_points, lat_points, indexing="ij")
+    inside = shapely.contains_xy(polygon, lons.ravel(), lats.ravel())
+    cells = tuple((float(lon), float(lat)) for lon, lat in zip(lons.ravel()[inside], lats.ravel()[inside]))
+    centroid = polygon.centroid
+    return PolygonGrid(
+        geometry=polygon,
+        bounds=(min_lon, min_lat, max_lon, max_lat),
+        center=(centroid.x, centroid.y),
+        cells=cells,
+        base_features=tuple(_static_layers.extract_weather_features({}, lat, lon) for lon, lat in cells)
+    )
+
+
+def _hash_coordinates(hasher, value) -> None:
+    """Position arrays go through numpy in one call each; only the nesting is walked in Python."""
+    if isinstance(value, (list, tuple)) and value and isinstance(value[0], (list, tuple)) and value[0] \
+            and isinstance(value[0][0], (list, tuple)):
+        hasher.update(b"[")
+        for item in value:
+            _hash_coordinates(hasher, item)
+        hasher.update(b"]")
+        return
+    # A position or a list of positions
+    positions = np.asarray(value, dtype=float)
+    hasher.update(f"{positions.shape}".encode())
+    # +0.0 folds -0.0 into 0.0
+    hasher.update((np.round(positions, GEOMETRY_HASH_DECIMALS) + 0.0).tobytes())
+
+
+def geometry_hash(geometry: dict) -> str:
+    """
+    Hash of the geometry's type and coordinates only. Key order, extra members
+    (bbox, crs) and number spelling (27, 27.0, 27.00000001) do not change it.
+    """
+    hasher = hashlib.sha256(str(geometry.get("type")).encode())
+    if "geometries" in geometry:
+        for member in geometry["geometries"]:
+            hasher.update(geometry_hash(member).encode())
+    else:
+        _hash_coordinates(hasher, geometry.get("coordinates"))
+    return hasher.hexdigest()
+
+
+def simplify_to_limit(polygon: BaseGeometry, max_vertices: int = POLYGON_MAX_VERTICES) -> BaseGeometry:
+    """
+    Topology-preserving simplification with a growing tolerance until the
+    polygon has at most `max_vertices` vertices. The tolerance starts at
+    1/10000 of the bbox diagonal, far below the nowcast grid spacing.
+    """
+    if shapely.get_num_coordinates(polygon) <= max_vertices:
+        return polygon
+    min_x, min_y, max_x, max_y = polygon.bounds
+    tolerance = max(((max_x - min_x) ** 2 + (max_y - min_y) ** 2) ** 0.5 * 1e-4, 1e-9)
+    simplified = polygon
+    for _ in range(20):
+        simplified = polygon.simplify(tolerance, preserve_topology=True)
+        if shapely.get_num_coordinates(simplified) <= max_vertices:
+            break
+        tolerance *= 2
+    return simplified
+
+
+_grid_cache = TTLCache(maxsize=POLYGON_CACHE_SIZE, ttl=POLYGON_CACHE_TTL_SECONDS)
+
+
+def grid_for_geojson(geometry: dict) -> PolygonGrid:
+    """
+    PolygonGrid of a client-sent GeoJSON geometry, from an LRU cache keyed by
+    its canonical hash: a polygon re-sent every minute is parsed, simplified
+    and masked once.
+    """
+    key = geometry_hash(geometry)
+    grid = _grid_cache.get(key)
+    if grid is None:
+        grid = build_polygon_grid(simplify_to_limit(shape(geometry)))
+        _grid_cache.set(key, grid)
+    return grid
@@ -1,8 +1,6 @@
-import numpy as np
 import asyncio
 from decimal import Decimal
 from typing import Optional
-from shapely.geometry import shape, Point
 from sqlalchemy.orm import Session
 from app.services.topography_service import TopographyService
 from app.services.drought_service import DroughtService
@@ -11,6 +9,10 @@ from app.services.risk_calculator import AdvancedFireRiskCalculator
 from app.utils.interpolation import inverse_distance_weighting
 from app.models.risk import RiskPoint, RiskResponse
 from app.models.fire_incident import FireIncident
+from app.services.alert_service import incident_payload, publish_high_risk, publish_incident_payload
+from app.services.geofence_service import publish_geofence_matches
+from app.services.district_registry import District
+from app.services.polygon_grid import PolygonGrid, grid_for_geojson
 
 weather_service = OpenWeatherService()
 risk_calculator = AdvancedFireRiskCalculator()
@@ -27,16 +29,36 @@ async def get_risk_nowcast_for_polygon_service(
     version,
     db: Optional[Session] = None
 ):
-    polygon = shape(polygon_request.geometry)
+    grid = grid_for_geojson(polygon_request.geometry)
     polygon_name = polygon_request.properties.get("name", "Unknown")
-    min_lon, min_lat, max_lon, max_lat = polygon.bounds
+    return await get_risk_nowcast_for_grid(grid, polygon_name, hourOffset, provider, version, db)
+
+async def get_risk_nowcast_for_district_service(
+    district: District,
+    hourOffset,
+    provider,
+    version,
+    db: Optional[Session] = None
+):
+    """Nowcast for a registry district: the grid was built at startup."""
+    return await get_risk_nowcast_for_grid(district.grid, district.name, hourOffset, provider, version, db)
+
+async def get_risk_nowcast_for_grid(
+    grid: PolygonGrid,
+    polygon_name: str,
+    hourOffset,
+    provider,
+    version,
+    db: Optional[Session] = None
+):
+    min_lon, min_lat, max_lon, max_lat = grid.bounds
     slope_factor_task = topography_service.get_slope_factor((min_lon, min_lat, max_lon, max_lat))
-    center_lon, center_lat = polygon.centroid.x, polygon.centroid.y
+    center_lon, center_lat = grid.center
     main_forecast_task = weather_service.get_forecast(center_lat, center_lon)
     slope_factor, main_forecast = await asyncio.gather(slope_factor_task, main_forecast_task)
     dry_days = drought_service.calculate_consecutive_dry_days(main_forecast['list']) if main_forecast and 'list' in main_forecast else 0
     drought_factor = drought_service.get_drought_factor(dry_days)
-    strategic_points = [(min_lon, min_lat), (max_lon, min_lat), (min_lon, max_lat), (max_lon, max_lat), (center_lon, center_lat)]
+    strategic_points = grid.strategic_points
     forecast_results = await asyncio.gather(*[weather_service.get_forecast(lat, lon) for lon, lat in strategic_points])
     processed_points = []
     for i, forecast in enumerate(forecast_results):
@@ -49,54 +71,51 @@ async def get_risk_nowcast_for_polygon_service(
         return RiskResponse(features=[])
     data_sets = {key: [(p['lon'], p['lat'], p['features'][key]) for p in processed_points]
                  for key in ["temperature_c", "relative_humidity", "wind_speed_ms", "wind_direction"]}
-    nx, ny = 20, 20
-    lon_points = np.linspace(min_lon, max_lon, nx)
-    lat_points = np.linspace(min_lat, max_lat, ny)
     risk_features_to_add = []
     high_risk_points = []  # Collect high risk points for incident creation
     
-    for p_lon in lon_points:
-        for p_lat in lat_points:
-            if Point(p_lon, p_lat).within(polygon):
-                point_features = weather_service.extract_weather_features({}, p_lat, p_lon)
-                for key, data in data_sets.items():
-                    point_features[key] = inverse_distance_weighting((p_lon, p_lat), data)
-                risk_value = risk_calculator.calculate_risk(point_features, slope_factor, drought_factor)
-                
-                # Track high risk points
-                if risk_value >= HIGH_RISK_THRESHOLD:
-                    high_risk_points.append({
-                        "lat": p_lat,
-                        "lon": p_lon,
-                        "risk": risk_value,
-                        "district": polygon_name
-                    })
-                
-                risk_features_to_add.append(RiskPoint(
-                    geometry={"type": "Point", "coordinates": [p_lon, p_lat]},
-                    properties={
-                        "risk": round(risk_value, 2), "temp": round(point_features['temperature_c'], 1),
-                        "rh": int(point_features['relative_humidity']), "wind": round(point_features['wind_speed_ms'], 1),
-                        "wind_dir": int(point_features.get('wind_direction', 0)),
-                        "fuel_moisture": round(point_features.get('fuel_moisture', 0.5), 2),
-                        "vegetation": point_features.get('vegetation_type', 'unknown'),
-                        "slope_factor": round(slope_factor, 2), "drought_factor": round(drought_factor, 2),
-                        "dry_days": dry_days, "provider": f"{provider}:v{version}"
-                    }
-                ))
+    for (p_lon, p_lat), base_features in zip(grid.cells, grid.base_features):
+        point_features = dict(base_features)
+        for key, data in data_sets.items():
+            point_features[key] = inverse_distance_weighting((p_lon, p_lat), data)
+        risk_value = risk_calculator.calculate_risk(point_features, slope_factor, drought_factor)
+        
+        # Track high risk points
+        if risk_value >= HIGH_RISK_THRESHOLD:
+            high_risk_points.append({
+                "lat": p_lat,
+                "lon": p_lon,
+                "risk": risk_value,
+                "district": polygon_name
+            })
+        
+        risk_features_to_add.append(RiskPoint(
+            geometry={"type": "Point", "coordinates": [p_lon, p_lat]},
+            properties={
+                "risk": round(risk_value, 2), "temp": round(point_features['temperature_c'], 1),
+                "rh": int(point_features['relative_humidity']), "wind": round(point_features['wind_speed_ms'], 1),
+                "wind_dir": int(point_features.get('wind_direction', 0)),
+                "fuel_moisture": round(point_features.get('fuel_moisture', 0.5), 2),
+                "vegetation": point_features.get('vegetation_type', 'unknown'),
+                "slope_factor": round(slope_factor, 2), "drought_factor": round(drought_factor, 2),
+                "dry_days": dry_days, "provider": f"{provider}:v{version}"
+            }
+        ))
     
     # Auto-create fire incident for highest risk point if above threshold
     incident_created = False
     incident_id = None
     
-    if db and high_risk_points:
-        # Get the highest risk point
-        highest_risk = max(high_risk_points, key=lambda x: x["risk"])
-        
+    highest_risk = max(high_risk_points, key=lambda x: x["risk"]) if high_risk_points else None
+    if highest_risk:
+        publish_high_risk(highest_risk["district"], highest_risk["lat"], highest_risk["lon"], highest_risk["risk"])
+    
+    if db and highest_risk:
         # Check if there's already an active incident in this district
         existing_incident = db.query(FireIncident).filter(
             FireIncident.district == highest_risk["district"],
-            FireIncident.status == "active"
+            FireIncident.status == "active",
+            FireIncident.deleted_at.is_(None)
         ).first()
         
         if not existing_incident:
@@ -113,6 +132,9 @@ async def get_risk_nowcast_for_polygon_service(
             db.refresh(fire_incident)
             incident_created = True
             incident_id = str(fire_incident.id)
+            payload = incident_payload(fire_incident, source="risk")
+            publish_incident_payload("incident.created", payload)
+            publish_geofence_matches("incident.created", payload)
             print(f"🔥 Auto-created fire incident in {highest_risk['district']} - Risk: {highest_risk['risk']*100:.1f}%")
     
     response = RiskResponse(features=risk_features_to_add)
@@ -0,0 +1,61 @@
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from app.utils.cache import TTLCache
+
+SMOKE_CACHE_TTL_SECONDS = float(os.getenv("SMOKE_CACHE_TTL_SECONDS", str(24 * 3600)))
+SMOKE_CACHE_MAXSIZE = int(os.getenv("SMOKE_CACHE_MAXSIZE", "2048"))
+# Optional persistent backend: parsed results are also written as JSON files here
+SMOKE_CACHE_DIR = os.getenv("SMOKE_CACHE_DIR")
+
+
+class SmokeResultCache:
+    """
+    Content-addressed cache of parsed detector results, keyed by the SHA-256
+    of the image bytes. In-memory LRU+TTL in front of an optional directory
+    of JSON files that survives restarts and is shared between workers.
+    """
+
+    def __init__(self, maxsize: int = SMOKE_CACHE_MAXSIZE, ttl: float = SMOKE_CACHE_TTL_SECONDS,
+                 directory: Optional[str] = SMOKE_CACHE_DIR):
+        self.ttl = ttl
+        self.directory = directory
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}.json")
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        value = self._memory.get(digest)
+        if value is not None or not self.directory:
+            return value
+        path = self._path(digest)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as fh:
+                value = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        self._memory.set(digest, value)
+        return value
+
+    def set(self, digest: str, value: Dict[str, Any]) -> None:
+        self._memory.set(digest, value)
+        if not self.directory:
+            return
+        path = self._path(digest)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(value, fh)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Smoke cache write failed ({digest}): {e}")
+
+
+smoke_result_cache = SmokeResultCache()
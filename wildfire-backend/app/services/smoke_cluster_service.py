@@ -0,0 +1,198 @@
+import math
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.smoke_cluster import SmokeCluster
+from app.models.smoke_detection import SmokeDetection
+
+# Detections within this distance and time of a cluster's last detection join it
+SMOKE_CLUSTER_RADIUS_KM = float(os.getenv("SMOKE_CLUSTER_RADIUS_KM", "2.0"))
+SMOKE_CLUSTER_WINDOW_MINUTES = float(os.getenv("SMOKE_CLUSTER_WINDOW_MINUTES", "120"))
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+@dataclass
+class ClusterEntry:
+    id: uuid.UUID
+    latitude: float
+    longitude: float
+    last_seen_at: datetime
+    report_id: Optional[int] = None
+
+
+class SpatioTemporalClusterer:
+    """
+    In-memory index of active clusters on a spatial hash grid (cell side = radius).
+    A lookup only visits the neighbouring cells of the detection, and clusters
+    older than the time window are evicted from a cell when it is visited, so
+    assignment is O(1) amortized per detection. The DB stays the source of truth
+    (smoke_clusters); the index is warmed from it at startup.
+    """
+
+    def __init__(self, radius_km: float = SMOKE_CLUSTER_RADIUS_KM,
+                 window: timedelta = timedelta(minutes=SMOKE_CLUSTER_WINDOW_MINUTES)):
+        self.radius_km = radius_km
+        self.window = window
+        self.cell_deg = radius_km / KM_PER_DEGREE
+        self._cells: Dict[Tuple[int, int], Set[uuid.UUID]] = {}
+        self._clusters: Dict[uuid.UUID, ClusterEntry] = {}
+        self._lock = threading.Lock()
+        # Serializes find -> commit -> record across this process's threads (see save_detection_results)
+        self.assignment_lock = threading.Lock()
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def _neighbour_cells(self, lat: float, lon: float):
+        row, col = self._cell(lat, lon)
+        # Longitude degrees shrink with latitude, so look further sideways
+        lon_span = math.ceil(1 / max(math.cos(math.radians(lat)), 0.01))
+        for d_row in (-1, 0, 1):
+            for d_col in range(-lon_span, lon_span + 1):
+                yield row + d_row, col + d_col
+
+    def find(self, lat: float, lon: float, at: datetime) -> Optional[ClusterEntry]:
+        """Nearest active cluster within radius/window, or None."""
+        best, best_distance = None, None
+        with self._lock:
+            for cell in self._neighbour_cells(lat, lon):
+                members = self._cells.get(cell)
+                if not members:
+                    continue
+                for cluster_id in list(members):
+                    entry = self._clusters[cluster_id]
+                    if at - entry.last_seen_at > self.window:
+                        self._evict(cluster_id)
+                        continue
+                    distance = haversine_km(lat, lon, entry.latitude, entry.longitude)
+                    if distance <= self.radius_km and (best_distance is None or distance < best_distance):
+                        best, best_distance = entry, distance
+        return best
+
+    def record(self, entry: ClusterEntry) -> None:
+        """Insert or move a cluster after its DB row was committed."""
+        with self._lock:
+            if entry.id in self._clusters:
+                self._evict(entry.id)
+            self._clusters[entry.id] = entry
+            self._cells.setdefault(self._cell(entry.latitude, entry.longitude), set()).add(entry.id)
+
+    def _evict(self, cluster_id: uuid.UUID) -> None:
+        entry = self._clusters.pop(cluster_id, None)
+        if entry is None:
+            return
+        cell = self._cell(entry.latitude, entry.longitude)
+        members = self._cells.get(cell)
+        if members:
+            members.discard(cluster_id)
+            if not members:
+                del self._cells[cell]
+
+    def load(self, db: Session) -> int:
+        """Warm the index with clusters still inside the time window."""
+        since = datetime.utcnow() - self.window
+        clusters = db.query(SmokeCluster).filter(SmokeCluster.last_seen_at >= since).all()
+        for cluster in clusters:
+            self.record(ClusterEntry(
+                id=cluster.id,
+                latitude=float(cluster.latitude),
+                longitude=float(cluster.longitude),
+                last_seen_at=cluster.last_seen_at,
+                report_id=cluster.report_id
+            ))
+        return len(clusters)
+
+
+clusterer = SpatioTemporalClusterer()
+
+
+def assign_cluster(
+    db: Session,
+    latitude: float,
+    longitude: float,
+    district: Optional[str],
+    risk_scores: List[float]
+) -> SmokeCluster:
+    """
+    Attach a group of detections from one location to its cluster (creating it
+    if needed) and update the cluster aggregates. Adds to the session only;
+    hold clusterer.assignment_lock until clusterer.record(...) after commit.
+    """
+    now = datetime.utcnow()
+    entry = clusterer.find(latitude, longitude, now)
+    cluster = db.get(SmokeCluster, entry.id) if entry else None
+    max_risk = Decimal(str(max(risk_scores)))
+    if cluster is None:
+        cluster = SmokeCluster(
+            id=uuid.uuid4(),
+            latitude=Decimal(str(latitude)),
+            longitude=Decimal(str(longitude)),
+            district=district,
+            detection_count=0,
+            max_risk_score=max_risk,
+            first_seen_at=now,
+            last_seen_at=now
+        )
+        db.add(cluster)
+    else:
+        # Running mean keeps the centroid near the fire as photos accumulate
+        count = cluster.detection_count or 0
+        new_count = count + len(risk_scores)
+        cluster.latitude = (cluster.latitude * count + Decimal(str(latitude)) * len(risk_scores)) / new_count
+        cluster.longitude = (cluster.longitude * count + Decimal(str(longitude)) * len(risk_scores)) / new_count
+        cluster.max_risk_score = max(cluster.max_risk_score or Decimal(0), max_risk)
+        cluster.last_seen_at = now
+        cluster.district = cluster.district or district
+    cluster.detection_count = (cluster.detection_count or 0) + len(risk_scores)
+    return cluster
+
+
+def cluster_entry(cluster: SmokeCluster) -> ClusterEntry:
+    return ClusterEntry(
+        id=cluster.id,
+        latitude=float(cluster.latitude),
+        longitude=float(cluster.longitude),
+        last_seen_at=cluster.last_seen_at,
+        report_id=cluster.report_id
+    )
+
+
+def get_smoke_clusters(db: Session, skip: int = 0, limit: int = 100, active: bool = False) -> List[SmokeCluster]:
+    """Duman kümelerini getir (son görülme zamanına göre)"""
+    query = db.query(SmokeCluster)
+    if active:
+        query = query.filter(SmokeCluster.last_seen_at >= datetime.utcnow() - clusterer.window)
+    return query.order_by(SmokeCluster.last_seen_at.desc()).offset(skip).limit(limit).all()
+
+
+def get_smoke_cluster_by_id(db: Session, cluster_id: uuid.UUID) -> Optional[SmokeCluster]:
+    """ID ile duman kümesi getir"""
+    return db.query(SmokeCluster).filter(SmokeCluster.id == cluster_id).first()
+
+
+def get_cluster_detections(db: Session, cluster_id: uuid.UUID, skip: int = 0, limit: int = 100) -> List[SmokeDetection]:
+    """Kümeye ait duman tespitleri"""
+    return (
+        db.query(SmokeDetection)
+        .filter(SmokeDetection.cluster_id == cluster_id)
+        .order_by(SmokeDetection.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,304 @@
+import asyncio
+import io
+import os
+from dataclasses import dataclass
+from typing import BinaryIO, List, Optional, Union
+
+import httpx
+import numpy as np
+
+ROBOFLOW_API_URL = "https://detect.roboflow.com"
+ROBOFLOW_API_KEY = os.getenv("ROBOFLOW_API_KEY", "XoNbKefV5xjEal7LJ744")
+ROBOFLOW_MODEL_ID = os.getenv("ROBOFLOW_MODEL_ID", "smoke-detection-5tkur/3")
+
+# "roboflow" (hosted API) or "local" (ONNX model loaded at startup)
+SMOKE_DETECTOR_BACKEND = os.getenv("SMOKE_DETECTOR_BACKEND", "roboflow")
+DETECTOR_TIMEOUT_SECONDS = float(os.getenv("DETECTOR_TIMEOUT_SECONDS", "30"))
+
+# Local model settings
+SMOKE_MODEL_PATH = os.getenv("SMOKE_MODEL_PATH", "models/smoke.onnx")
+SMOKE_MODEL_INPUT_SIZE = int(os.getenv("SMOKE_MODEL_INPUT_SIZE", "640"))
+SMOKE_MODEL_CLASSES = os.getenv("SMOKE_MODEL_CLASSES", "smoke").split(",")
+SMOKE_MODEL_MIN_CONFIDENCE = float(os.getenv("SMOKE_MODEL_MIN_CONFIDENCE", "0.25"))
+
+# Micro-batching: concurrent requests arriving within the window share one inference call
+SMOKE_BATCH_WINDOW_MS = float(os.getenv("SMOKE_BATCH_WINDOW_MS", "15"))
+SMOKE_MAX_BATCH_SIZE = int(os.getenv("SMOKE_MAX_BATCH_SIZE", "8"))
+
+
+@dataclass
+class DetectorImage:
+    """One image to run through a detector (file object is read, never copied up front)."""
+    file: BinaryIO
+    filename: str = "upload.jpg"
+    content_type: str = "application/octet-stream"
+
+    @classmethod
+    def from_bytes(cls, data: bytes, filename: str = "upload.jpg", content_type: str = "image/jpeg"):
+        return cls(io.BytesIO(data), filename, content_type)
+
+    def read_bytes(self) -> bytes:
+        self.file.seek(0)
+        return self.file.read()
+
+
+class SmokeDetector:
+    """
+    Detector interface. Results use the Roboflow response shape
+    ({"predictions": [{"x", "y", "width", "height", "confidence", "class"}]})
+    so parse_predictions works for every backend.
+    """
+    name = "base"
+    # Backends that gain from running several images in one call
+    supports_batching = False
+
+    async def startup(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def detect(self, image: DetectorImage) -> dict:
+        raise NotImplementedError
+
+    async def detect_batch(self, images: List[DetectorImage]) -> List[Union[dict, Exception]]:
+        """One result per image, in order; an image that failed gets its exception instead."""
+        return list(await asyncio.gather(*[self.detect(image) for image in images], return_exceptions=True))
+
+
+class RoboflowDetector(SmokeDetector):
+    """Hosted Roboflow inference over a shared pooled HTTP client."""
+    name = "roboflow"
+
+    def __init__(self, api_url: str = ROBOFLOW_API_URL, api_key: str = ROBOFLOW_API_KEY,
+                 model_id: str = ROBOFLOW_MODEL_ID):
+        self.detect_url = f"{api_url}/{model_id}"
+        self.api_key = api_key
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=DETECTOR_TIMEOUT_SECONDS,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._client
+
+    @client.setter
+    def client(self, value: httpx.AsyncClient):
+        self._client = value
+
+    async def shutdown(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def detect(self, image: DetectorImage) -> dict:
+        # httpx streams file objects in chunks into the multipart body
+        image.file.seek(0)
+        files = {"file": (image.filename, image.file, image.content_type)}
+        response = await self.client.post(self.detect_url, params={"api_key": self.api_key}, files=files)
+        response.raise_for_status()
+        return response.json()
+
+
+class LocalOnnxDetector(SmokeDetector):
+    """
+    Local ONNX model, loaded once at startup and run on CPU.
+
+    Expects a detector exported with NMS: input float32 [N, 3, S, S] (RGB, 0-1),
+    output [N, boxes, 6] rows of (x1, y1, x2, y2, score, class_id) in input pixels.
+    Requires the optional `onnxruntime` and `Pillow` packages.
+    """
+    name = "local"
+    supports_batching = True
+
+    def __init__(self, model_path: str = SMOKE_MODEL_PATH, input_size: int = SMOKE_MODEL_INPUT_SIZE,
+                 class_names: List[str] = SMOKE_MODEL_CLASSES, min_confidence: float = SMOKE_MODEL_MIN_CONFIDENCE):
+        self.model_path = model_path
+        self.input_size = input_size
+        self.class_names = class_names
+        self.min_confidence = min_confidence
+        self._session = None
+        self._input_name = None
+
+    async def startup(self):
+        if self._session is not None:
+            return
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise RuntimeError("SMOKE_DETECTOR_BACKEND=local requires onnxruntime (pip install onnxruntime pillow)") from e
+        loop = asyncio.get_running_loop()
+        self._session = await loop.run_in_executor(
+            None, lambda: onnxruntime.InferenceSession(self.model_path, providers=["CPUExecutionProvider"])
+        )
+        self._input_name = self._session.get_inputs()[0].name
+        print(f"Local smoke model loaded: {self.model_path}")
+
+    async def detect(self, image: DetectorImage) -> dict:
+        result = (await self.detect_batch([image]))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def detect_batch(self, images: List[DetectorImage]) -> List[Union[dict, Exception]]:
+        if self._session is None:
+            await self.startup()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._infer, images)
+
+    def _load(self, image: DetectorImage):
+        from PIL import Image
+
+        with Image.open(image.file) as img:
+            img = img.convert("RGB")
+            width, height = img.size
+            resized = img.resize((self.input_size, self.input_size), Image.BILINEAR)
+        array = np.asarray(resized, dtype=np.float32) / 255.0
+        return array.transpose(2, 0, 1), width, height
+
+    def _infer(self, images: List[DetectorImage]) -> List[Union[dict, Exception]]:
+        # Each image is decoded on its own: a corrupt upload fails only its
+        # own slot, not the other requests sharing the batch.
+        results: List[Union[dict, Exception]] = [None] * len(images)
+        inputs, slots = [], []
+        for index, image in enumerate(images):
+            try:
+                image.file.seek(0)
+                array, width, height = self._load(image)
+            except Exception as e:
+                results[index] = e
+                continue
+            inputs.append(array)
+            slots.append((index, width, height))
+        if not inputs:
+            return results
+
+        outputs = self._session.run(None, {self._input_name: np.stack(inputs)})[0]
+
+        for rows, (index, width, height) in zip(outputs, slots):
+            scale_x, scale_y = width / self.input_size, height / self.input_size
+            predictions = []
+            for x1, y1, x2, y2, score, class_id in rows:
+                if score < self.min_confidence:
+                    continue
+                class_index = int(class_id)
+                predictions.append({
+                    "x": float((x1 + x2) / 2 * scale_x),
+                    "y": float((y1 + y2) / 2 * scale_y),
+                    "width": float((x2 - x1) * scale_x),
+                    "height": float((y2 - y1) * scale_y),
+                    "confidence": float(score),
+                    "class": self.class_names[class_index] if class_index < len(self.class_names) else str(class_index),
+                })
+            results[index] = {"image": {"width": width, "height": height}, "predictions": predictions}
+        return results
+
+
+class MicroBatcher:
+    """
+    Collects concurrent detect() calls for up to `window_ms` (or `max_batch_size`
+    images) and runs them as one detect_batch() call. One batch runs at a
+    time; requests arriving meanwhile form the next batch.
+    """
+
+    def __init__(self, detector: SmokeDetector, max_batch_size: int = SMOKE_MAX_BATCH_SIZE,
+                 window_ms: float = SMOKE_BATCH_WINDOW_MS):
+        self.detector = detector
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._batch: list = []
+
+    async def submit(self, image: DetectorImage) -> dict:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image, future))
+        return await future
+
+    async def _collect(self) -> list:
+        # Kept on self so close() can fail requests taken off the queue
+        self._batch = batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    @staticmethod
+    def _fail(batch: list, error: Exception) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            try:
+                results = await self.detector.detect_batch([image for image, _ in batch])
+            except Exception as e:
+                self._fail(batch, e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            if len(results) != len(batch):
+                # Never leave a caller waiting on a result that will not come
+                self._fail(batch, RuntimeError(f"Detector returned {len(results)} results for {len(batch)} images"))
+
+    async def close(self):
+        """Stop the worker; queued and in-flight requests fail instead of waiting forever."""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        error = RuntimeError("Smoke detector is shutting down")
+        # Futures already resolved are skipped by _fail
+        self._fail(self._batch, error)
+        self._batch = []
+        while self._queue is not None and not self._queue.empty():
+            self._fail([self._queue.get_nowait()], error)
+
+
+def _build_detector(backend: str) -> SmokeDetector:
+    if backend == "local":
+        return LocalOnnxDetector()
+    if backend == "roboflow":
+        return RoboflowDetector()
+    raise ValueError(f"Unknown SMOKE_DETECTOR_BACKEND: {backend}")
+
+
+detector: SmokeDetector = _build_detector(SMOKE_DETECTOR_BACKEND)
+_batcher: Optional[MicroBatcher] = MicroBatcher(detector) if detector.supports_batching else None
+
+
+async def run_detection(image: DetectorImage) -> dict:
+    """Run one image through the configured backend (micro-batched when supported)."""
+    if _batcher is not None:
+        return await _batcher.submit(image)
+    return await detector.detect(image)
+
+
+async def startup():
+    await detector.startup()
+
+
+async def shutdown():
+    if _batcher is not None:
+        await _batcher.close()
+    await detector.shutdown()
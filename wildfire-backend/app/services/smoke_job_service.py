@@ -0,0 +1,222 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from app.db import SessionLocal
+from app.services import smoke_service
+from app.utils.cache import TTLCache
+
+SMOKE_JOB_WORKERS = int(os.getenv("SMOKE_JOB_WORKERS", "2"))
+SMOKE_JOB_QUEUE_MAXSIZE = int(os.getenv("SMOKE_JOB_QUEUE_MAXSIZE", "100"))
+# Finished jobs stay pollable this long
+SMOKE_JOB_RESULT_TTL_SECONDS = float(os.getenv("SMOKE_JOB_RESULT_TTL_SECONDS", "3600"))
+SSE_HEARTBEAT_SECONDS = 15
+
+
+@dataclass
+class SmokeJob:
+    id: str
+    image_path: str
+    filename: Optional[str]
+    content_type: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    district: Optional[str]
+    tiled: Optional[bool] = None
+    status: str = "queued"  # queued | running | done | failed
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error
+        }
+
+    def set_status(self, status: str):
+        self.status = status
+        # Wake current SSE listeners, then re-arm for the next change
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+
+class SmokeJobQueue:
+    """
+    Background smoke detection: uploads are copied to a temp file, queued,
+    and processed by a fixed pool of asyncio workers. Results are kept in a
+    TTL cache for polling / SSE.
+    """
+
+    def __init__(self, workers: int = SMOKE_JOB_WORKERS, maxsize: int = SMOKE_JOB_QUEUE_MAXSIZE):
+        self.worker_count = workers
+        self.maxsize = maxsize
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list = []
+        self._jobs = TTLCache(maxsize=max(1000, maxsize * 10), ttl=SMOKE_JOB_RESULT_TTL_SECONDS)
+        self._running = 0
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        # Jobs still queued will never run: fail them and delete their copies
+        while self._queue is not None and not self._queue.empty():
+            job = self._queue.get_nowait()
+            self._remove_copy(job.image_path)
+            job.error = "Smoke detection was cancelled by a server shutdown"
+            job.finished_at = time.time()
+            job.set_status("failed")
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.worker_count,
+            "running": self._running,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_capacity": self.maxsize
+        }
+
+    def get(self, job_id: str) -> Optional[SmokeJob]:
+        return self._jobs.get(job_id)
+
+    async def submit(
+        self,
+        file: UploadFile,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        district: Optional[str] = None,
+        tiled: Optional[bool] = None
+    ) -> SmokeJob:
+        if self._queue is None:
+            raise HTTPException(status_code=503, detail="Smoke job workers are not running")
+        if self._queue.full():
+            raise self._queue_full()
+        smoke_service.ensure_upload_size(file)
+
+        # The request's UploadFile is closed when the response is sent, so keep our own copy
+        image_path = await asyncio.to_thread(self._copy_upload, file)
+        job = SmokeJob(
+            id=str(uuid.uuid4()),
+            image_path=image_path,
+            filename=file.filename,
+            content_type=file.content_type,
+            latitude=latitude,
+            longitude=longitude,
+            district=district,
+            tiled=tiled
+        )
+        self._jobs.set(job.id, job)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            # Other submits filled the queue while this upload was being copied
+            self._jobs.pop(job.id)
+            self._remove_copy(image_path)
+            raise self._queue_full()
+        return job
+
+    @staticmethod
+    def _queue_full() -> HTTPException:
+        return HTTPException(
+            status_code=503,
+            detail="Smoke detection queue is full, please retry later",
+            headers={"Retry-After": "5"}
+        )
+
+    @staticmethod
+    def _remove_copy(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _copy_upload(file: UploadFile) -> str:
+        file.file.seek(0)
+        with tempfile.NamedTemporaryFile(prefix="smoke-job-", delete=False) as tmp:
+            shutil.copyfileobj(file.file, tmp, smoke_service.UPLOAD_CHUNK_BYTES)
+            return tmp.name
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            self._running += 1
+            try:
+                await self._process(job)
+            finally:
+                self._running -= 1
+                self._queue.task_done()
+
+    async def _process(self, job: SmokeJob):
+        job.started_at = time.time()
+        job.set_status("running")
+        try:
+            with open(job.image_path, "rb") as fh:
+                upload = UploadFile(
+                    file=fh,
+                    size=os.path.getsize(job.image_path),
+                    filename=job.filename,
+                    headers=Headers({"content-type": job.content_type or "application/octet-stream"})
+                )
+                analysis = await smoke_service.analyze_upload(upload, job.tiled)
+            saved = await asyncio.to_thread(self._save, job, analysis)
+            job.result = smoke_service.build_detection_response(analysis, saved)
+            job.finished_at = time.time()
+            job.set_status("done")
+        except Exception as e:
+            job.error = e.detail if isinstance(e, HTTPException) else f"Smoke detection failed: {str(e)}"
+            job.finished_at = time.time()
+            job.set_status("failed")
+        finally:
+            self._remove_copy(job.image_path)
+
+    @staticmethod
+    def _save(job: SmokeJob, analysis: dict):
+        db = SessionLocal()
+        try:
+            [saved] = smoke_service.save_detection_results(
+                db, [{"analysis": analysis, "filename": job.filename}],
+                job.latitude, job.longitude, job.district
+            )
+            return saved
+        finally:
+            db.close()
+
+    async def events(self, job: SmokeJob) -> AsyncIterator[str]:
+        """Server-sent events: one `status` event per change, ending with the final result."""
+        while True:
+            changed = job.changed
+            yield f"event: status\ndata: {json.dumps(job.to_dict(), default=str)}\n\n"
+            if job.status in ("done", "failed"):
+                return
+            while True:
+                try:
+                    await asyncio.wait_for(changed.wait(), SSE_HEARTBEAT_SECONDS)
+                    break
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+
+
+smoke_job_queue = SmokeJobQueue()
@@ -0,0 +1,86 @@
+import asyncio
+import io
+import os
+from typing import Optional, Tuple
+
+from app.services.smoke_detectors import DetectorImage
+
+# Phone photos (5-12 MB) are shrunk to the model's input resolution before
+# upload; the detector works at a fixed small size anyway.
+SMOKE_PREPROCESS_ENABLED = os.getenv("SMOKE_PREPROCESS_ENABLED", "true").lower() == "true"
+SMOKE_PREPROCESS_MAX_SIDE = int(os.getenv("SMOKE_PREPROCESS_MAX_SIDE", "640"))
+SMOKE_PREPROCESS_JPEG_QUALITY = int(os.getenv("SMOKE_PREPROCESS_JPEG_QUALITY", "85"))
+
+
+def _downscale(image: DetectorImage, max_side: int, quality: int) -> Tuple[Optional[bytes], dict]:
+    from PIL import Image, ImageOps
+
+    image.file.seek(0, os.SEEK_END)
+    original_bytes = image.file.tell()
+    image.file.seek(0)
+    with Image.open(image.file) as img:
+        original_size = img.size
+        # JPEG draft mode decodes at a reduced scale (size changes, aspect kept)
+        img.draft("RGB", (max_side, max_side))
+        decoded_size = img.size
+        # Any Orientation other than 1 (incl. 180°, which keeps the size) changes the pixels
+        rotated = img.getexif().get(0x0112, 1) != 1
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        if img.size != decoded_size:
+            original_size = original_size[::-1]
+        img.thumbnail((max_side, max_side), Image.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=quality, optimize=True)
+        sent_size = img.size
+    data = buffer.getvalue()
+    stats = {
+        "original_bytes": original_bytes,
+        "sent_bytes": len(data),
+        "original_size": list(original_size),
+        "sent_size": list(sent_size)
+    }
+    if len(data) >= original_bytes and sent_size == original_size and not rotated:
+        # Already small and upright: keep the original bytes
+        stats["sent_bytes"] = original_bytes
+        return None, stats
+    return data, stats
+
+
+async def preprocess_image(
+    image: DetectorImage,
+    max_side: int = SMOKE_PREPROCESS_MAX_SIDE,
+    quality: int = SMOKE_PREPROCESS_JPEG_QUALITY
+) -> Tuple[DetectorImage, Optional[dict]]:
+    """
+    Decode, downsize to `max_side` and re-encode as JPEG in a worker thread.
+    Returns the image to send and before/after stats (None if disabled or undecodable).
+    """
+    if not SMOKE_PREPROCESS_ENABLED:
+        return image, None
+    try:
+        data, stats = await asyncio.to_thread(_downscale, image, max_side, quality)
+    except Exception as e:
+        print(f"Smoke preprocess skipped ({image.filename}): {e}")
+        image.file.seek(0)
+        return image, None
+    if data is None:
+        image.file.seek(0)
+        return image, stats
+    name = os.path.splitext(image.filename)[0] + ".jpg"
+    return DetectorImage.from_bytes(data, name, "image/jpeg"), stats
+
+
+def rescale_predictions(result: dict, stats: Optional[dict]) -> dict:
+    """Map boxes from the downscaled image back to original-image pixels."""
+    if not stats or stats["sent_size"] == stats["original_size"] or not result:
+        return result
+    scale_x = stats["original_size"][0] / stats["sent_size"][0]
+    scale_y = stats["original_size"][1] / stats["sent_size"][1]
+    predictions = []
+    for prediction in result.get("predictions", []):
+        prediction = dict(prediction)
+        for key, scale in (("x", scale_x), ("width", scale_x), ("y", scale_y), ("height", scale_y)):
+            if key in prediction:
+                prediction[key] = prediction[key] * scale
+        predictions.append(prediction)
+    return {**result, "predictions": predictions}
@@ -1,43 +1,109 @@
 import os
-import httpx
-from fastapi import UploadFile
+import asyncio
+import hashlib
+from contextlib import nullcontext
+from fastapi import UploadFile, HTTPException
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from app.models.smoke_detection import SmokeDetection
 from app.models.fire_report import FireReport
-
-ROBOFLOW_API_URL = "https://detect.roboflow.com"
-ROBOFLOW_API_KEY = "XoNbKefV5xjEal7LJ744"
-ROBOFLOW_MODEL_ID = "smoke-detection-5tkur/3"
+from app.services.smoke_cache import smoke_result_cache
+from app.services.smoke_detectors import DetectorImage, run_detection
+from app.services.smoke_tiling import detect_tiled
+from app.services.smoke_preprocess import preprocess_image, rescale_predictions
+from app.services import image_store
+from app.services.smoke_cluster_service import assign_cluster, cluster_entry, clusterer
+from app.services.alert_service import alert_broker
 
 # Risk threshold for auto-creating fire report (50%)
 AUTO_REPORT_THRESHOLD = 0.5
 
-async def detect_smoke_service(
-    file: UploadFile,
-    db: Optional[Session] = None,
-    latitude: Optional[float] = None,
-    longitude: Optional[float] = None,
-    district: Optional[str] = None
-):
+# Largest image accepted by /smoke/detect (default 15 MB)
+SMOKE_MAX_UPLOAD_BYTES = int(os.getenv("SMOKE_MAX_UPLOAD_BYTES", str(15 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+# /smoke/detect_batch limits
+SMOKE_BATCH_MAX_FILES = int(os.getenv("SMOKE_BATCH_MAX_FILES", "50"))
+SMOKE_BATCH_CONCURRENCY = int(os.getenv("SMOKE_BATCH_CONCURRENCY", "4"))
+
+# Tiled detection (see smoke_tiling) when the request does not say
+SMOKE_TILED_DEFAULT = os.getenv("SMOKE_TILED_DEFAULT", "false").lower() == "true"
+
+
+def get_upload_size(file: UploadFile) -> int:
+    """Size of the spooled upload without reading it into memory."""
+    if file.size is not None:
+        return file.size
+    current = file.file.tell()
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(current)
+    return size
+
+
+def ensure_upload_size(file: UploadFile):
+    """Reject uploads above SMOKE_MAX_UPLOAD_BYTES with 413."""
+    if get_upload_size(file) > SMOKE_MAX_UPLOAD_BYTES:
+        _raise_too_large()
+
+
+def _raise_too_large():
+    raise HTTPException(
+        status_code=413,
+        detail=f"Image too large (max {SMOKE_MAX_UPLOAD_BYTES} bytes)"
+    )
+
+
+def _hash_and_store(file: UploadFile) -> Tuple[str, Optional[str]]:
     """
-    Smoke detection service:
-    1. Send image to Roboflow AI
-    2. Save result to smoke_detections table
-    3. If risk > 50%, auto-create fire_report
+    One pass over the spooled upload, chunk by chunk: SHA-256 (size limit
+    enforced while reading) and the image store copy. -> (digest, stored URL)
     """
-    contents = await file.read()
-    detect_url = f"{ROBOFLOW_API_URL}/{ROBOFLOW_MODEL_ID}"
-    params = {"api_key": ROBOFLOW_API_KEY}
-    files = {"file": (file.filename or "upload.jpg", contents, file.content_type or "application/octet-stream")}
-    
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.post(detect_url, params=params, files=files)
-        response.raise_for_status()
-        result = response.json()
-    
+    digest = hashlib.sha256()
+    total = 0
+    staged = image_store.stage_image()
+    try:
+        file.file.seek(0)
+        while True:
+            chunk = file.file.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > SMOKE_MAX_UPLOAD_BYTES:
+                _raise_too_large()
+            digest.update(chunk)
+            if staged is not None:
+                try:
+                    staged.write(chunk)
+                except OSError as e:
+                    # Storing is best effort; the detection goes on without it
+                    print(f"Image store write failed: {e}")
+                    staged.discard()
+                    staged = None
+        file.file.seek(0)
+        image_hash = digest.hexdigest()
+        stored_url = None
+        if staged is not None:
+            try:
+                stored_url = staged.commit(image_hash, file.content_type)
+            except OSError as e:
+                print(f"Image store write failed ({image_hash}): {e}")
+        return image_hash, stored_url
+    finally:
+        if staged is not None:
+            staged.discard()
+
+
+async def hash_upload(file: UploadFile) -> Tuple[str, Optional[str]]:
+    """SHA-256 of the upload (cache key and stored file name) and its image store URL, in one read."""
+    return await asyncio.to_thread(_hash_and_store, file)
+
+
+def parse_predictions(result: dict) -> tuple[float, list]:
+    """Roboflow response -> (max_confidence, detections)"""
     max_confidence = 0.0
     detections = []
     if result and "predictions" in result:
@@ -48,54 +114,326 @@ async def detect_smoke_service(
                 detections.append({
                     "confidence": confidence,
                     "class": prediction.get("class", "smoke"),
-                    "bbox": prediction.get("bbox", {})
+                    "bbox": prediction.get("bbox") or _prediction_box(prediction)
                 })
+    return max_confidence, detections
+
+
+def _prediction_box(prediction: dict) -> dict:
+    """Roboflow boxes come as center x/y + width/height on the prediction itself"""
+    return {key: prediction[key] for key in ("x", "y", "width", "height") if key in prediction}
+
+
+async def _run_detector(file: UploadFile, tiled: bool = False) -> Tuple[dict, Optional[dict]]:
+    """Returns (detector result in original-image pixels, preprocess stats)"""
+    # The spooled file object is passed through; backends stream or decode it
+    await file.seek(0)
+    image = DetectorImage(file.file, file.filename or "upload.jpg", file.content_type or "application/octet-stream")
+    if tiled:
+        result, _ = await detect_tiled(image)
+        return result, None
+    image, stats = await preprocess_image(image)
+    result = await run_detection(image)
+    return rescale_predictions(result, stats), stats
+
+
+async def analyze_upload(file: UploadFile, tiled: Optional[bool] = None) -> dict:
+    """Size check + content hash + cache lookup, running the detector only on a miss."""
+    tiled = SMOKE_TILED_DEFAULT if tiled is None else tiled
+    ensure_upload_size(file)
+    image_hash, stored_url = await hash_upload(file)
+    cache_key = f"{image_hash}:tiled" if tiled else image_hash
     
-    risk_score = max_confidence * 100
-    detection_id = None
-    report_created = False
-    report_id = None
+    cached = smoke_result_cache.get(cache_key)
+    if cached is None:
+        result, preprocess = await _run_detector(file, tiled)
+        max_confidence, detections = parse_predictions(result)
+        smoke_result_cache.set(cache_key, {
+            "max_confidence": max_confidence,
+            "detections": detections,
+            "raw_result": result,
+            "preprocess": preprocess
+        })
+    else:
+        max_confidence = cached["max_confidence"]
+        detections = cached["detections"]
+        result = cached["raw_result"]
+        preprocess = cached.get("preprocess")
     
-    # Save to database if session provided
-    if db:
-        # 1. Save smoke detection
-        smoke_detection = SmokeDetection(
-            image_url=file.filename or "uploaded_image.jpg",
-            latitude=Decimal(str(latitude)) if latitude else None,
-            longitude=Decimal(str(longitude)) if longitude else None,
-            district=district,
-            risk_score=Decimal(str(max_confidence)),
-            status="confirmed" if max_confidence > AUTO_REPORT_THRESHOLD else "pending"
-        )
-        db.add(smoke_detection)
-        db.commit()
-        db.refresh(smoke_detection)
-        detection_id = str(smoke_detection.id)
-        
-        # 2. Auto-create fire report if risk > threshold
-        if max_confidence > AUTO_REPORT_THRESHOLD:
-            fire_report = FireReport(
-                title=f"Otomatik Duman Tespiti - Risk: {risk_score:.1f}%",
-                description=f"AI tarafından tespit edildi. Confidence: {max_confidence:.2f}. Tespit sayısı: {len(detections)}",
-                location=district or "Bilinmeyen konum",
-                image_url=file.filename,
-                status="pending"
-            )
-            db.add(fire_report)
+    return {
+        "image_hash": image_hash,
+        "image_url": stored_url,
+        "max_confidence": max_confidence,
+        "detections": detections,
+        "raw_result": result,
+        "preprocess": preprocess,
+        "cached": cached is not None
+    }
+
+
+def save_detection_results(
+    db: Session,
+    items: List[dict],
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    district: Optional[str] = None
+) -> List[dict]:
+    """
+    Bulk-insert smoke_detections rows (and auto fire_reports for risk > threshold)
+    for analyzed images in a single transaction.
+    
+    With a location, the detections join their spatio-temporal cluster and the
+    cluster has a single fire_report (created on its first confirmed detection,
+    updated afterwards). Without a location each confirmed detection gets its own report.
+    Blocking (DB and clusterer.assignment_lock): call it from async code via
+    asyncio.to_thread. The lock only serializes cluster assignment within one
+    process; with several uvicorn workers two detections of the same fire can
+    still each start a cluster.
+    items: [{"analysis": ..., "filename": ...}]
+    -> [{"detection_id", "report_id", "report_created", "cluster_id"}]
+    """
+    detection_rows = []
+    for item in items:
+        max_confidence = item["analysis"]["max_confidence"]
+        # Stored image URL when the image store is enabled, else just the filename
+        image_url = item["analysis"].get("image_url") or item["filename"]
+        detection_rows.append({
+            "image_url": image_url or "uploaded_image.jpg",
+            "latitude": Decimal(str(latitude)) if latitude else None,
+            "longitude": Decimal(str(longitude)) if longitude else None,
+            "district": district,
+            "risk_score": Decimal(str(max_confidence)),
+            "status": "confirmed" if max_confidence > AUTO_REPORT_THRESHOLD else "pending"
+        })
+    confirmed = [index for index, row in enumerate(detection_rows) if row["status"] == "confirmed"]
+    report_ids: List[Optional[int]] = [None] * len(items)
+    created = [False] * len(items)
+    cluster = None
+    
+    located = latitude is not None and longitude is not None
+    # Held from the cluster lookup until the cluster is committed and indexed,
+    # so two concurrent detections of one fire cannot both start a cluster
+    with clusterer.assignment_lock if located else nullcontext():
+        try:
+            if located:
+                cluster = assign_cluster(
+                    db, latitude, longitude, district, [item["analysis"]["max_confidence"] for item in items]
+                )
+                db.flush()
+                for row in detection_rows:
+                    row["cluster_id"] = cluster.id
+            
+            detection_ids = db.scalars(
+                insert(SmokeDetection).returning(SmokeDetection.id, sort_by_parameter_order=True),
+                detection_rows
+            ).all()
+            
+            if cluster is not None and confirmed:
+                report_id, report_created = _upsert_cluster_report(db, cluster, detection_rows[confirmed[0]]["image_url"])
+                for index in confirmed:
+                    report_ids[index] = report_id
+                created[confirmed[0]] = report_created
+            elif confirmed:
+                report_rows = [
+                    _report_values(items[index], detection_rows[index]["image_url"], district)
+                    for index in confirmed
+                ]
+                new_ids = db.scalars(
+                    insert(FireReport).returning(FireReport.id, sort_by_parameter_order=True),
+                    report_rows
+                ).all()
+                for index, report_id in zip(confirmed, new_ids):
+                    report_ids[index] = report_id
+                    created[index] = True
+            
+            entry = cluster_entry(cluster) if cluster is not None else None
             db.commit()
-            db.refresh(fire_report)
-            report_created = True
-            report_id = fire_report.id
+        except Exception:
+            db.rollback()
+            raise
+        
+        if entry is not None:
+            clusterer.record(entry)
     
+    saved = [
+        {
+            "detection_id": str(detection_id),
+            "report_id": report_ids[index],
+            "report_created": created[index],
+            "cluster_id": str(entry.id) if entry else None
+        }
+        for index, detection_id in enumerate(detection_ids)
+    ]
+    _publish_report_alerts(saved, items, district, latitude, longitude)
+    return saved
+
+
+def _publish_report_alerts(saved: List[dict], items: List[dict], district, latitude, longitude) -> None:
+    """report.created per new auto-report, one report.updated when a cluster's report grew."""
+    updated = None
+    for row, item in zip(saved, items):
+        if row["report_id"] is None:
+            continue
+        payload = {
+            "report_id": row["report_id"],
+            "detection_id": row["detection_id"],
+            "cluster_id": row["cluster_id"],
+            "risk_score": item["analysis"]["max_confidence"],
+            "image_url": item["analysis"].get("image_url")
+        }
+        if row["report_created"]:
+            alert_broker.publish("report.created", payload, district, latitude, longitude)
+        elif updated is None or payload["risk_score"] > updated["risk_score"]:
+            updated = payload
+    if updated is not None:
+        alert_broker.publish("report.updated", updated, district, latitude, longitude)
+
+
+def _report_values(item: dict, image_url: Optional[str], district: Optional[str]) -> dict:
+    max_confidence = item["analysis"]["max_confidence"]
+    return {
+        "title": f"Otomatik Duman Tespiti - Risk: {max_confidence * 100:.1f}%",
+        "description": f"AI tarafından tespit edildi. Confidence: {max_confidence:.2f}. Tespit sayısı: {len(item['analysis']['detections'])}",
+        "location": district or "Bilinmeyen konum",
+        "image_url": image_url,
+        "status": "pending"
+    }
+
+
+def _upsert_cluster_report(db: Session, cluster, image_url: Optional[str]) -> Tuple[int, bool]:
+    """One fire_report per cluster: create it, or refresh its title/description."""
+    max_risk = float(cluster.max_risk_score or 0)
+    title = f"Otomatik Duman Tespiti - Risk: {max_risk * 100:.1f}%"
+    description = (
+        f"AI tarafından tespit edildi. En yüksek confidence: {max_risk:.2f}. "
+        f"Kümedeki tespit sayısı: {cluster.detection_count}"
+    )
+    report = db.get(FireReport, cluster.report_id) if cluster.report_id else None
+    if report is not None and report.deleted_at is None:
+        report.title = title
+        report.description = description
+        return report.id, False
+    
+    report = FireReport(
+        title=title,
+        description=description,
+        location=cluster.district or "Bilinmeyen konum",
+        image_url=image_url,
+        status="pending"
+    )
+    db.add(report)
+    db.flush()
+    cluster.report_id = report.id
+    return report.id, True
+
+
+def build_detection_response(analysis: dict, saved: Optional[dict] = None) -> dict:
+    max_confidence = analysis["max_confidence"]
+    saved = saved or {}
     return {
         "success": True,
-        "risk_score": risk_score,
+        "risk_score": max_confidence * 100,
         "confidence": max_confidence,
-        "detections": detections,
-        "detection_count": len(detections),
-        "detection_id": detection_id,
-        "report_created": report_created,
-        "report_id": report_id,
-        "raw_result": result
+        "detections": analysis["detections"],
+        "detection_count": len(analysis["detections"]),
+        "detection_id": saved.get("detection_id"),
+        "image_url": analysis.get("image_url"),
+        "cluster_id": saved.get("cluster_id"),
+        "report_created": saved.get("report_created", False),
+        "report_id": saved.get("report_id"),
+        "cached": analysis["cached"],
+        "preprocess": analysis.get("preprocess"),
+        "raw_result": analysis["raw_result"]
     }
 
+
+async def detect_smoke_service(
+    file: UploadFile,
+    db: Optional[Session] = None,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    district: Optional[str] = None,
+    tiled: Optional[bool] = None
+):
+    """
+    Smoke detection service:
+    1. Look the image up in the content-hash cache, else run the detector backend
+       (optionally over overlapping tiles, merged with NMS)
+    2. Save result to smoke_detections table
+    3. Attach it to its spatio-temporal cluster (when a location is given)
+    4. If risk > 50%, auto-create (or update the cluster's) fire_report
+    """
+    analysis = await analyze_upload(file, tiled)
+    
+    # Save to database if session provided (single commit for both rows)
+    if db:
+        # Off the event loop: it may wait on clusterer.assignment_lock held by a job worker thread
+        [saved] = await asyncio.to_thread(
+            save_detection_results,
+            db, [{"analysis": analysis, "filename": file.filename}], latitude, longitude, district
+        )
+        return build_detection_response(analysis, saved)
+    
+    return build_detection_response(analysis)
+
+
+async def detect_smoke_batch_service(
+    files: List[UploadFile],
+    db: Optional[Session] = None,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    district: Optional[str] = None,
+    tiled: Optional[bool] = None
+):
+    """
+    Batch smoke detection for a burst of photos from one location:
+    detections run concurrently (at most SMOKE_BATCH_CONCURRENCY at a time),
+    then all rows are written in one transaction. Results are per image,
+    in upload order; a failed image does not fail the batch.
+    """
+    if len(files) > SMOKE_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files (max {SMOKE_BATCH_MAX_FILES})"
+        )
+    semaphore = asyncio.Semaphore(SMOKE_BATCH_CONCURRENCY)
+    
+    async def analyze(file: UploadFile):
+        async with semaphore:
+            try:
+                return await analyze_upload(file, tiled)
+            except HTTPException as e:
+                return e
+            except Exception as e:
+                return HTTPException(status_code=500, detail=f"Smoke detection failed: {str(e)}")
+    
+    analyses = await asyncio.gather(*[analyze(file) for file in files])
+    
+    succeeded = [
+        {"index": index, "analysis": analysis, "filename": files[index].filename}
+        for index, analysis in enumerate(analyses)
+        if not isinstance(analysis, HTTPException)
+    ]
+    saved = {}
+    if db and succeeded:
+        rows = await asyncio.to_thread(save_detection_results, db, succeeded, latitude, longitude, district)
+        saved = {item["index"]: row for item, row in zip(succeeded, rows)}
+    
+    results = []
+    for index, analysis in enumerate(analyses):
+        if isinstance(analysis, HTTPException):
+            results.append({
+                "filename": files[index].filename,
+                "success": False,
+                "status_code": analysis.status_code,
+                "error": analysis.detail
+            })
+            continue
+        results.append({"filename": files[index].filename, **build_detection_response(analysis, saved.get(index))})
+    
+    return {
+        "total": len(files),
+        "succeeded": len(succeeded),
+        "reports_created": sum(1 for r in results if r.get("report_created")),
+        "results": results
+    }
@@ -0,0 +1,121 @@
+import asyncio
+import io
+import os
+from typing import BinaryIO, List, Tuple
+
+import numpy as np
+
+from app.services.smoke_detectors import DetectorImage, run_detection
+from app.services.smoke_preprocess import preprocess_image, rescale_predictions
+
+# Tiled mode for large drone/camera frames: overlapping square tiles are
+# detected separately so small distant plumes keep enough pixels.
+SMOKE_TILE_SIZE = int(os.getenv("SMOKE_TILE_SIZE", "640"))
+SMOKE_TILE_OVERLAP = float(os.getenv("SMOKE_TILE_OVERLAP", "0.2"))
+# Images whose longer side is below this are sent whole even in tiled mode
+SMOKE_TILE_MIN_SIDE = int(os.getenv("SMOKE_TILE_MIN_SIDE", str(int(SMOKE_TILE_SIZE * 1.5))))
+SMOKE_NMS_IOU_THRESHOLD = float(os.getenv("SMOKE_NMS_IOU_THRESHOLD", "0.5"))
+TILE_JPEG_QUALITY = 90
+
+
+def tile_origins(length: int, tile: int, overlap: float) -> List[int]:
+    """Start offsets along one axis so tiles overlap and the last tile ends at the edge."""
+    if length <= tile:
+        return [0]
+    stride = max(1, int(tile * (1 - overlap)))
+    origins = list(range(0, length - tile, stride))
+    origins.append(length - tile)
+    return origins
+
+
+def split_into_tiles(file: BinaryIO, tile: int = SMOKE_TILE_SIZE, overlap: float = SMOKE_TILE_OVERLAP):
+    """
+    Decode once and cut JPEG tiles -> (width, height, [(x0, y0, DetectorImage)]).
+    The compressed upload is read from its (spooled) file, but the decoded
+    frame is held in memory while cutting: width x height x 3 bytes, e.g.
+    ~72 MB for a 24 MP drone frame. Bound it with the upload size limit and
+    Pillow's MAX_IMAGE_PIXELS.
+    """
+    from PIL import Image, ImageOps
+
+    file.seek(0)
+    with Image.open(file) as img:
+        # Upright like the preprocessed (non-tiled) path, so both report boxes in the same frame
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        width, height = img.size
+        if max(width, height) < SMOKE_TILE_MIN_SIDE:
+            return width, height, []
+        tiles = []
+        for y0 in tile_origins(height, tile, overlap):
+            for x0 in tile_origins(width, tile, overlap):
+                crop = img.crop((x0, y0, min(x0 + tile, width), min(y0 + tile, height)))
+                buffer = io.BytesIO()
+                crop.save(buffer, format="JPEG", quality=TILE_JPEG_QUALITY)
+                tiles.append((x0, y0, DetectorImage.from_bytes(buffer.getvalue(), f"tile_{x0}_{y0}.jpg")))
+    return width, height, tiles
+
+
+def non_max_suppression(predictions: List[dict], iou_threshold: float = SMOKE_NMS_IOU_THRESHOLD) -> List[dict]:
+    """Greedy per-class NMS over Roboflow-style (center x/y, width, height) boxes."""
+    kept = []
+    for class_name in {p.get("class", "smoke") for p in predictions}:
+        group = [p for p in predictions if p.get("class", "smoke") == class_name]
+        boxes = np.array([
+            [p["x"] - p["width"] / 2, p["y"] - p["height"] / 2, p["x"] + p["width"] / 2, p["y"] + p["height"] / 2]
+            for p in group
+        ], dtype=np.float64)
+        scores = np.array([p["confidence"] for p in group], dtype=np.float64)
+        areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        order = scores.argsort()[::-1]
+        while order.size:
+            best = order[0]
+            kept.append(group[best])
+            rest = order[1:]
+            xx1 = np.maximum(boxes[best, 0], boxes[rest, 0])
+            yy1 = np.maximum(boxes[best, 1], boxes[rest, 1])
+            xx2 = np.minimum(boxes[best, 2], boxes[rest, 2])
+            yy2 = np.minimum(boxes[best, 3], boxes[rest, 3])
+            intersection = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+            iou = intersection / np.maximum(areas[best] + areas[rest] - intersection, 1e-9)
+            order = rest[iou <= iou_threshold]
+    return sorted(kept, key=lambda p: p["confidence"], reverse=True)
+
+
+def _shift(prediction: dict, x0: int, y0: int) -> dict:
+    shifted = dict(prediction)
+    shifted["x"] = prediction["x"] + x0
+    shifted["y"] = prediction["y"] + y0
+    return shifted
+
+
+async def detect_tiled(image: DetectorImage) -> Tuple[dict, int]:
+    """
+    Run the detector over overlapping tiles and merge boxes with NMS.
+    Returns a Roboflow-shaped result (full-image coordinates) and the tile count;
+    small images fall back to the normal (preprocessed) whole-image call.
+    """
+    width, height, tiles = await asyncio.to_thread(split_into_tiles, image.file)
+    if not tiles:
+        image.file.seek(0)
+        image, stats = await preprocess_image(image)
+        return rescale_predictions(await run_detection(image), stats), 1
+
+    # Concurrent calls; the local backend's micro-batcher turns them into batches.
+    # A failed or timed-out tile only loses its own boxes.
+    results = await asyncio.gather(*[run_detection(tile_image) for _, _, tile_image in tiles], return_exceptions=True)
+    failed = [result for result in results if isinstance(result, BaseException)]
+    if len(failed) == len(tiles):
+        raise failed[0]
+    predictions = [
+        _shift(prediction, x0, y0)
+        for (x0, y0, _), result in zip(tiles, results)
+        if not isinstance(result, BaseException)
+        for prediction in (result or {}).get("predictions", [])
+        if {"x", "y", "width", "height", "confidence"} <= prediction.keys()
+    ]
+    merged = non_max_suppression(predictions) if predictions else []
+    result = {"image": {"width": width, "height": height}, "predictions": merged, "tiles": len(tiles)}
+    if failed:
+        print(f"Tiled detection: {len(failed)}/{len(tiles)} tiles failed ({failed[0]})")
+        result["failed_tiles"] = len(failed)
+    return result, len(tiles)
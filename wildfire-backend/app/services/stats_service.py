@@ -0,0 +1,204 @@
+import asyncio
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, insert, text
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.daily_rollup import DailyRollup, RollupWatermark
+from app.models.fire_incident import FireIncident
+from app.models.fire_report import FireReport
+from app.models.smoke_detection import SmokeDetection
+
+STATS_ROLLUP_INTERVAL_SECONDS = float(os.getenv("STATS_ROLLUP_INTERVAL_SECONDS", "60"))
+# Same reasoning as the sync cursor: re-examine a few seconds of changes so a
+# transaction that commits late with an older updated_at is not skipped.
+STATS_ROLLUP_LAG_SECONDS = float(os.getenv("STATS_ROLLUP_LAG_SECONDS", "5"))
+
+# entity -> (model, district column). Reports have no district; their free-text
+# location is used instead (auto-reports store the district there).
+ROLLUP_ENTITIES = {
+    "incidents": (FireIncident, FireIncident.district),
+    "detections": (SmokeDetection, SmokeDetection.district),
+    "reports": (FireReport, FireReport.location),
+}
+
+
+def _as_date(value) -> date:
+    # func.date() returns a date on PostgreSQL and a string on SQLite
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _live(model):
+    return model.deleted_at.is_(None) if hasattr(model, "deleted_at") else True
+
+
+def _changed_days(db: Session, entity: str, since: Optional[datetime]) -> Tuple[Set[date], Optional[datetime]]:
+    """Creation days of rows touched after `since` (updated_at index), and the newest updated_at seen"""
+    model, _ = ROLLUP_ENTITIES[entity]
+    query = db.query(func.date(model.created_at), func.max(model.updated_at))
+    if since is not None:
+        query = query.filter(model.updated_at > since)
+    days: Set[date] = set()
+    latest = None
+    for day, updated_at in query.group_by(func.date(model.created_at)):
+        if day is None:
+            continue
+        days.add(_as_date(day))
+        if updated_at is not None and (latest is None or updated_at > latest):
+            latest = updated_at
+    return days, latest
+
+
+def _key(value: Optional[str], column) -> str:
+    # Locations and statuses are free text; rollup keys are bounded so one
+    # long value cannot make the insert (and every later refresh) fail.
+    return (value or "")[:column.type.length]
+
+
+def _recount_day(db: Session, entity: str, day: date) -> List[dict]:
+    # The whole day is recounted: a row whose district or status changed has
+    # to leave its old bucket too, and only the new values are visible.
+    model, district_column = ROLLUP_ENTITIES[entity]
+    start = datetime.combine(day, datetime.min.time())
+    query = db.query(district_column, model.status, func.count()).filter(
+        model.created_at >= start,
+        model.created_at < start + timedelta(days=1),
+        _live(model)
+    )
+    counts: Dict[Tuple[str, str], int] = defaultdict(int)
+    for district, status, count in query.group_by(district_column, model.status):
+        counts[(_key(district, DailyRollup.district), _key(status or "unknown", DailyRollup.status))] += count
+    return [
+        {"entity": entity, "day": day, "district": district, "status": status, "count": count}
+        for (district, status), count in counts.items()
+    ]
+
+
+def _try_lock(db: Session, entity: str) -> bool:
+    """Only one worker refreshes an entity at a time (transaction-scoped advisory lock on PostgreSQL)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return bool(db.execute(
+        text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"), {"key": f"daily_rollups:{entity}"}
+    ).scalar())
+
+
+def _refresh_entity(db: Session, entity: str, now: datetime) -> Optional[int]:
+    """One entity in one transaction; None when another worker holds its lock."""
+    try:
+        if not _try_lock(db, entity):
+            db.rollback()
+            return None
+        state = db.get(RollupWatermark, entity) or RollupWatermark(entity=entity)
+        days, latest = _changed_days(db, entity, state.watermark)
+        for day in sorted(days):
+            rows = _recount_day(db, entity, day)
+            db.execute(delete(DailyRollup).where(DailyRollup.entity == entity, DailyRollup.day == day))
+            if rows:
+                db.execute(insert(DailyRollup), rows)
+        if latest is not None:
+            # Capped by the clock: once the lag window has passed the watermark
+            # moves beyond the newest row and idle ticks recount nothing.
+            candidate = min(latest, now - timedelta(seconds=STATS_ROLLUP_LAG_SECONDS))
+            state.watermark = max(state.watermark, candidate) if state.watermark else candidate
+        state.refreshed_at = now
+        db.add(state)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(days)
+
+
+def refresh_rollups(db: Session) -> dict:
+    """
+    Fold rows changed since each entity's watermark into daily_rollups.
+    Only the days those rows were created on are recounted and replaced, so
+    the cost follows the change rate, not the table size. The first run (no
+    watermark) rebuilds everything. Each entity commits on its own: a failing
+    one is raised after the others are refreshed. Returns {entity: days refreshed}.
+    """
+    refreshed = {}
+    error = None
+    now = datetime.utcnow()
+    for entity in ROLLUP_ENTITIES:
+        try:
+            days = _refresh_entity(db, entity, now)
+        except Exception as e:
+            error = error or e
+            continue
+        if days is not None:
+            refreshed[entity] = days
+    if error is not None:
+        raise error
+    return refreshed
+
+
+def _range_filter(query, since: Optional[date], until: Optional[date], district: Optional[str]):
+    if since is not None:
+        query = query.filter(DailyRollup.day >= since)
+    if until is not None:
+        query = query.filter(DailyRollup.day <= until)
+    if district is not None:
+        query = query.filter(DailyRollup.district == district)
+    return query
+
+
+def get_daily_stats(db: Session, entity: str, since: Optional[date] = None, until: Optional[date] = None,
+                    district: Optional[str] = None) -> List[dict]:
+    """Günlük sayılar (ilçeler toplanmış) -> [{day, status, count}]"""
+    query = db.query(DailyRollup.day, DailyRollup.status, func.sum(DailyRollup.count)).filter(DailyRollup.entity == entity)
+    query = _range_filter(query, since, until, district)
+    rows = query.group_by(DailyRollup.day, DailyRollup.status).order_by(DailyRollup.day, DailyRollup.status)
+    return [{"day": day, "status": status, "count": int(count)} for day, status, count in rows]
+
+
+def get_district_stats(db: Session, entity: str, since: Optional[date] = None, until: Optional[date] = None) -> List[dict]:
+    """Tarih aralığında ilçe bazında sayılar -> [{district, status, count}]"""
+    query = db.query(DailyRollup.district, DailyRollup.status, func.sum(DailyRollup.count)).filter(DailyRollup.entity == entity)
+    query = _range_filter(query, since, until, None)
+    rows = query.group_by(DailyRollup.district, DailyRollup.status).order_by(DailyRollup.district, DailyRollup.status)
+    return [{"district": district or None, "status": status, "count": int(count)} for district, status, count in rows]
+
+
+def get_refreshed_at(db: Session, entity: str) -> Optional[datetime]:
+    state = db.get(RollupWatermark, entity)
+    return state.refreshed_at if state else None
+
+
+class RollupRefresher:
+    """Runs refresh_rollups every STATS_ROLLUP_INTERVAL_SECONDS in a worker thread."""
+
+    def __init__(self, interval: float = STATS_ROLLUP_INTERVAL_SECONDS):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh_now)
+            except Exception as e:
+                print(f"Stats rollup refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    @staticmethod
+    def refresh_now() -> dict:
+        with SessionLocal() as db:
+            return refresh_rollups(db)
+
+
+rollup_refresher = RollupRefresher()
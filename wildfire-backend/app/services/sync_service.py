@@ -0,0 +1,98 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.fire_incident import FireIncident
+from app.models.fire_report import FireReport
+from app.models.fire_station import FireStation
+from app.models.smoke_detection import SmokeDetection
+
+SYNC_PAGE_LIMIT = int(os.getenv("SYNC_PAGE_LIMIT", "500"))
+SYNC_MAX_PAGE_LIMIT = int(os.getenv("SYNC_MAX_PAGE_LIMIT", "5000"))
+# updated_at is stamped before commit, so a slow transaction can become visible
+# with a timestamp older than a cursor already handed out. The caught-up cursor
+# never passes now minus this much; rows inside that window are re-sent until
+# it has passed, never missed.
+SYNC_CURSOR_LAG_SECONDS = float(os.getenv("SYNC_CURSOR_LAG_SECONDS", "5"))
+
+SYNC_TABLES = {
+    "fire_stations": FireStation,
+    "fire_incidents": FireIncident,
+    "fire_reports": FireReport,
+    "smoke_detections": SmokeDetection,
+}
+
+
+def encode_cursor(value: datetime) -> str:
+    return value.isoformat()
+
+
+def decode_cursor(cursor: str) -> datetime:
+    """ValueError for anything that is not a cursor we issued."""
+    return datetime.fromisoformat(cursor)
+
+
+def _has_tombstones(model) -> bool:
+    return hasattr(model, "deleted_at")
+
+
+def _changed_rows(db: Session, model, since: Optional[datetime], limit: Optional[int] = None, at: Optional[datetime] = None):
+    query = db.query(model)
+    if at is not None:
+        query = query.filter(model.updated_at == at)
+    elif since is not None:
+        query = query.filter(model.updated_at > since)
+    elif _has_tombstones(model):
+        # Initial snapshot: a new client has nothing to delete
+        query = query.filter(model.deleted_at.is_(None))
+    query = query.order_by(model.updated_at, model.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def _sort_key(row) -> datetime:
+    return row.updated_at or datetime.min
+
+
+def get_changes(db: Session, since: Optional[datetime], limit: int = SYNC_PAGE_LIMIT, tables: Optional[List[str]] = None) -> dict:
+    """
+    Rows of the synced tables whose updated_at is after `since`, oldest first,
+    as {table: {"upserted": [...], "deleted": [tombstones]}} plus the next cursor.
+    Each table is read through its updated_at index with at most limit + 1 rows,
+    so the cost follows the change rate instead of the table size.
+    """
+    names = tables or list(SYNC_TABLES)
+    now = datetime.utcnow()
+    merged = []
+    for name in names:
+        merged.extend((name, row) for row in _changed_rows(db, SYNC_TABLES[name], since, limit + 1))
+    merged.sort(key=lambda item: _sort_key(item[1]))
+
+    has_more = len(merged) > limit
+    if has_more:
+        # Never split rows sharing a timestamp across pages: the cursor is strict (>)
+        boundary = _sort_key(merged[limit - 1][1])
+        page = [item for item in merged[:limit] if _sort_key(item[1]) < boundary]
+        if not page:
+            page = [(name, row) for name in names for row in _changed_rows(db, SYNC_TABLES[name], since, at=boundary)]
+        cursor = _sort_key(page[-1][1])
+    else:
+        page = merged
+        # Capped by the clock, not the newest row: once the lag window has
+        # passed, the cursor moves beyond it and idle polls come back empty.
+        horizon = now - timedelta(seconds=SYNC_CURSOR_LAG_SECONDS)
+        latest = max((_sort_key(row) for _, row in page), default=None)
+        cursor = min(latest, horizon) if latest is not None else horizon
+        if since is not None:
+            cursor = max(since, cursor)
+
+    changes = {name: {"upserted": [], "deleted": []} for name in names}
+    for name, row in page:
+        if getattr(row, "deleted_at", None) is not None:
+            changes[name]["deleted"].append({"id": row.id, "deleted_at": row.deleted_at})
+        else:
+            changes[name]["upserted"].append(row)
+    return {"cursor": encode_cursor(cursor), "has_more": has_more, "server_time": now, **changes}
@@ -1,11 +1,22 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, func, text
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.auth import UserUpdate
 from app.utils.security import get_password_hash
+from app.utils.dependencies import invalidate_cached_user
+from app.services.geofence_service import geofence_index
 from typing import Optional
 import uuid
+import os
+
+# Above this many rows an unfiltered listing reports the planner's estimate
+# (pg_class.reltuples) instead of counting every user.
+USER_COUNT_ESTIMATE_THRESHOLD = int(os.getenv("USER_COUNT_ESTIMATE_THRESHOLD", "100000"))
+
+# Size of the users table as of the last unfiltered listing (exact count or
+# estimate). Small tables never pay for the pg_class lookup.
+_user_count_hint = {"rows": 0}
 
 
 def get_user_by_id(db: Session, user_id: uuid.UUID) -> Optional[User]:
@@ -24,9 +35,19 @@ def get_all_users(
     limit: int = 100,
     search: Optional[str] = None,
     role: Optional[str] = None
-) -> tuple[list[User], int]:
-    """Get all users with optional filtering."""
+) -> tuple[list[User], Optional[int]]:
+    """
+    Get all users with optional filtering.
+
+    The total comes from a window count on the same query as the page, so
+    there is a single round-trip. Unfiltered listings of a table last seen at
+    USER_COUNT_ESTIMATE_THRESHOLD rows or more report the planner's estimate
+    instead. Search terms are matched with ILIKE, which the pg_trgm GIN
+    indexes on email/full_name can serve. A page past the end has no row to
+    carry the count, so its total is None.
+    """
     query = db.query(User)
+    filtered = bool(search or role)
     
     # Search filter
     if search:
@@ -41,10 +62,28 @@ def get_all_users(
     if role:
         query = query.filter(User.role == role)
     
-    total = query.count()
-    users = query.offset(skip).limit(limit).all()
+    page = query.order_by(User.created_at.desc()).offset(skip).limit(limit)
+    if not filtered and _user_count_hint["rows"] >= USER_COUNT_ESTIMATE_THRESHOLD:
+        estimate = _estimated_user_count(db)
+        _user_count_hint["rows"] = estimate
+        if estimate >= USER_COUNT_ESTIMATE_THRESHOLD:
+            return page.all(), estimate
     
-    return users, total
+    rows = page.add_columns(func.count().over().label("total")).all()
+    if not rows:
+        return [], None if skip else 0
+    total = rows[0][1]
+    if not filtered:
+        _user_count_hint["rows"] = total
+    return [row[0] for row in rows], total
+
+
+def _estimated_user_count(db: Session) -> int:
+    """Planner row estimate for the users table (cheap, no scan)."""
+    estimate = db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'users'")
+    ).scalar()
+    return int(estimate or 0)
 
 
 def update_user(
@@ -87,6 +126,7 @@ def update_user(
     
     db.commit()
     db.refresh(user)
+    invalidate_cached_user(user_id)
     
     return user
 
@@ -102,6 +142,8 @@ def delete_user(db: Session, user_id: uuid.UUID) -> bool:
     
     db.delete(user)
     db.commit()
+    invalidate_cached_user(user_id)
+    geofence_index.remove_user(user_id)
     
     return True
 
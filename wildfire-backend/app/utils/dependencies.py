@@ -4,9 +4,25 @@ from sqlalchemy.orm import Session
 from app.db import SessionLocal
 from app.models.user import User
 from app.utils.security import decode_access_token
+from app.utils.cache import TTLCache
 import uuid
+import os
+from typing import Optional
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+# Same scheme for endpoints that are public but show more to logged-in users
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
+
+# Resolved principals keyed by (user_id, token). Entries are dropped explicitly
+# when a user is updated/deleted; the TTL bounds staleness across workers.
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAXSIZE = int(os.getenv("PRINCIPAL_CACHE_MAXSIZE", "4096"))
+_principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_MAXSIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def invalidate_cached_user(user_id: uuid.UUID) -> None:
+    """Forget every cached principal for a user (role/email/password changes, deletion)."""
+    _principal_cache.discard_where(lambda key: key[0] == user_id)
 
 
 def get_db():
@@ -18,37 +34,61 @@ def get_db():
         db.close()
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token."""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
+def resolve_user(db: Session, token: str) -> Optional[User]:
+    """User for a JWT access token (through the principal cache), None if the token or user is invalid."""
     payload = decode_access_token(token)
     if payload is None:
-        raise credentials_exception
+        return None
     
     user_id_str: str = payload.get("sub")
     if user_id_str is None:
-        raise credentials_exception
+        return None
     
     try:
         user_id = uuid.UUID(user_id_str)
     except ValueError:
-        raise credentials_exception
+        return None
+    
+    cache_key = (user_id, token)
+    cached_user = _principal_cache.get(cache_key)
+    if cached_user is not None:
+        # Attach a copy to this request's session without emitting a SELECT
+        return db.merge(cached_user, load=False)
     
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
-        raise credentials_exception
+        return None
     
+    db.expunge(user)
+    _principal_cache.set(cache_key, user)
+    return db.merge(user, load=False)
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get current authenticated user from JWT token."""
+    user = resolve_user(db, token)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
+async def get_optional_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Optional[User]:
+    """Current user if a token was sent, None for anonymous requests (invalid token is still 401)."""
+    if token is None:
+        return None
+    return await get_current_user(token, db)
+
+
 async def get_current_admin(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -0,0 +1,14 @@
+from typing import Tuple
+
+BBox = Tuple[float, float, float, float]
+
+
+def parse_bbox(value: str) -> BBox:
+    """"minLon,minLat,maxLon,maxLat" -> tuple (ValueError if malformed)"""
+    try:
+        parts = [float(part) for part in value.split(",")]
+    except ValueError:
+        raise ValueError("bbox must be minLon,minLat,maxLon,maxLat")
+    if len(parts) != 4 or parts[0] > parts[2] or parts[1] > parts[3]:
+        raise ValueError("bbox must be minLon,minLat,maxLon,maxLat")
+    return tuple(parts)
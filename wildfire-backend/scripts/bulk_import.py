@@ -0,0 +1,56 @@
+"""
+Bulk-load fire stations or incidents from a GeoJSON FeatureCollection or CSV.
+
+Same validation and loader as POST /fire-stations/import and
+POST /fire-incidents/import, without the HTTP upload:
+
+    python -m scripts.bulk_import stations data/stations.geojson
+    python -m scripts.bulk_import incidents incidents.csv --chunk-size 5000 --dry-run
+
+Exit status is 1 when any row was rejected; the per-row report is printed
+(or written as JSON with --report).
+"""
+import argparse
+import json
+import sys
+
+from app.db import SessionLocal
+from app.services import import_service
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("entity", choices=sorted(import_service.IMPORT_ENTITIES))
+    parser.add_argument("path", help=".csv, .geojson or .json file")
+    parser.add_argument("--format", choices=("csv", "geojson"), help="default: from the file extension")
+    parser.add_argument("--chunk-size", type=int, default=import_service.IMPORT_CHUNK_SIZE)
+    parser.add_argument("--method", choices=("insert", "copy"), help="default: copy on PostgreSQL")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, roll back")
+    parser.add_argument("--report", help="write the full JSON report to this file")
+    args = parser.parse_args()
+
+    file_format = args.format or import_service.detect_format(args.path)
+    with open(args.path, "rb") as file, SessionLocal() as db:
+        try:
+            report = import_service.import_rows(
+                db, args.entity, file, file_format, args.chunk_size, args.method, args.dry_run
+            )
+        except import_service.ImportFormatError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+
+    print(f"{report['entity']}: {report['processed']} rows, {report['imported']} imported, "
+          f"{report['failed']} failed ({report['method']}, {report['duration_ms']} ms"
+          f"{', dry run' if report['dry_run'] else ''})")
+    for error in report["errors"][:20]:
+        print(f"  row {error['row']}: {'; '.join(error['errors'])}")
+    if report["failed"] > 20:
+        print(f"  ... {report['failed'] - 20} more")
+    if args.report:
+        with open(args.report, "w") as out:
+            json.dump(report, out, indent=2, default=str)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
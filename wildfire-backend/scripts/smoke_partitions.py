@@ -0,0 +1,46 @@
+"""
+Maintain the monthly smoke_detections partitions outside the API process
+(e.g. from cron, with SMOKE_PARTITION_INTERVAL_SECONDS=0 on the API):
+
+    python -m scripts.smoke_partitions                # create ahead + archive expired
+    python -m scripts.smoke_partitions --list
+    python -m scripts.smoke_partitions --retention-months 6 --archive-dir /mnt/archive
+
+Archived months are written as <archive-dir>/smoke_detections_yYYYYmMM.csv.gz
+and their partitions dropped.
+"""
+import argparse
+import sys
+
+from app.db import SessionLocal
+from app.services import partition_service
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--list", action="store_true", help="only list the existing partitions")
+    parser.add_argument("--months-ahead", type=int, default=partition_service.SMOKE_PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--retention-months", type=int, default=partition_service.SMOKE_RETENTION_MONTHS,
+                        help="0 disables archival")
+    parser.add_argument("--archive-dir", default=partition_service.SMOKE_ARCHIVE_DIR)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if not partition_service.is_partitioned(db):
+            print("error: smoke_detections is not partitioned (run alembic upgrade on PostgreSQL)", file=sys.stderr)
+            return 2
+        if args.list:
+            for month in partition_service.list_partitions(db):
+                print(partition_service.partition_name(month))
+            return 0
+        created = partition_service.ensure_partitions(db, args.months_ahead)
+        archived = partition_service.archive_partitions(db, args.retention_months, args.archive_dir)
+
+    print(f"created {len(created)} partition(s){': ' + ', '.join(created) if created else ''}")
+    for path in archived:
+        print(f"archived {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())